@@ -0,0 +1,133 @@
+"""
+Author-string handling shared by the scrapers and the loaders.
+
+AuthorNormalizer precompiles its patterns once and memoizes results in a
+bounded LRU cache: the same author strings repeat on thousands of pages, so
+after warm-up a lookup is one dict hit instead of several regex passes.
+
+It also interns canonical author names into a name -> id table, so a loader
+can split "A, B" into authors and reuse the same id for every book by that
+author. Ids are per instance (and per process); build the table in the
+process that writes the data.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from functools import lru_cache
+from typing import Iterable
+
+NAME_CONNECTORS = frozenset({"de", "da", "del", "van", "von", "bin", "binti", "al", "el", "la", "le", "di", "du"})
+
+AND_RE = re.compile(r"\s+\band\b\s+", re.IGNORECASE)
+HAS_LETTER_RE = re.compile(r"[A-Za-z]")
+NAME_LIKE_RE = re.compile(r"[A-Za-z][A-Za-z .'-]*(?:, [A-Za-z][A-Za-z .'-]*)*(?: and [A-Za-z][A-Za-z .'-]*)?")
+CAPS_WORD_RE = re.compile(r"\b[A-Z][a-z]+(?:'[A-Za-z]+)?\b")
+
+
+class AuthorNormalizer:
+    def __init__(self, bad_phrases: Iterable[str] = (), cache_size: int = 8192) -> None:
+        self.bad_phrases = tuple(bad_phrases)
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize)
+        self.is_author_string = lru_cache(maxsize=cache_size)(self._is_author_string)
+        self._ids: dict[str, int] = {}
+        self._names: list[str] = []
+        self._lock = threading.Lock()
+
+    # ---------- string -> normalized "A, B, C" ----------
+
+    @staticmethod
+    def _normalize(authors: str | None) -> str | None:
+        if not authors:
+            return None
+
+        s = " ".join(authors.split())
+
+        if "," in s:
+            parts = [p.strip() for p in s.split(",") if p.strip()]
+            return ", ".join(parts) if parts else None
+
+        s = AND_RE.sub(", ", s)
+
+        tokens = s.split()
+        if len(tokens) <= 2:
+            return s
+
+        # A capitalised word (not a connector like "van") starts a new name once the current one has 2+ words
+        chunks: list[str] = []
+        current: list[str] = [tokens[0]]
+        for w in tokens[1:]:
+            if len(current) >= 2 and w[:1].isupper() and w.lower() not in NAME_CONNECTORS:
+                chunks.append(" ".join(current))
+                current = [w]
+            else:
+                current.append(w)
+        chunks.append(" ".join(current))
+
+        if len(chunks) <= 1:
+            return s
+        return ", ".join(chunks)
+
+    def _is_author_string(self, s: str) -> bool:
+        if not s:
+            return False
+
+        s_clean = " ".join(s.split())
+        if len(s_clean) > 80:
+            return False
+
+        low = s_clean.lower()
+        if any(p in low for p in self.bad_phrases):
+            return False
+
+        if not HAS_LETTER_RE.search(s_clean):
+            return False
+
+        if "." in s_clean or s_clean.count(",") > 6:
+            return False
+
+        if NAME_LIKE_RE.fullmatch(s_clean):
+            return True
+
+        return len(CAPS_WORD_RE.findall(s_clean)) >= 2
+
+    # ---------- name interning ----------
+
+    @staticmethod
+    def split_names(authors: str | None) -> list[str]:
+        """Normalized "A, B" -> ["A", "B"]."""
+        if not authors:
+            return []
+        return [n for n in (p.strip() for p in authors.split(",")) if n]
+
+    def intern(self, name: str) -> int:
+        """Stable id for a canonical author name (case/whitespace-insensitive; first spelling wins)."""
+        key = " ".join(name.split()).casefold()
+        author_id = self._ids.get(key)
+        if author_id is None:
+            with self._lock:
+                author_id = self._ids.get(key)
+                if author_id is None:
+                    self._names.append(" ".join(name.split()))
+                    author_id = self._ids[key] = len(self._names)
+        return author_id
+
+    def author_ids(self, authors: str | None) -> list[int]:
+        """Ids of the authors in a (raw or normalized) author string, in order, without repeats."""
+        ids = (self.intern(n) for n in self.split_names(self.normalize(authors)))
+        return list(dict.fromkeys(ids))
+
+    def name(self, author_id: int) -> str:
+        return self._names[author_id - 1]
+
+    def table(self) -> dict[int, str]:
+        """id -> canonical name, for loading an authors table."""
+        return dict(enumerate(self._names, start=1))
+
+    def cache_info(self) -> dict[str, object]:
+        return {
+            "normalize": self.normalize.cache_info(),
+            "is_author_string": self.is_author_string.cache_info(),
+            "interned": len(self._names),
+        }
@@ -0,0 +1,26 @@
+import os
+
+# Task 1 crawl settings (override via environment variables)
+SCRAPE_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "8"))   # total in-flight pages
+SCRAPE_PER_HOST = int(os.getenv("SCRAPE_PER_HOST", "4"))         # in-flight pages per host
+SCRAPE_DELAY = float(os.getenv("SCRAPE_DELAY", "0"))             # extra fixed pause per worker slot (seconds)
+SCRAPE_RATE = float(os.getenv("SCRAPE_RATE", "1.0"))             # starting requests/sec per host (adapts up/down)
+SCRAPE_RATE_MIN = float(os.getenv("SCRAPE_RATE_MIN", "0.1"))     # floor after repeated 429/5xx back-offs
+SCRAPE_RATE_MAX = float(os.getenv("SCRAPE_RATE_MAX", "8.0"))     # ceiling while the host stays fast
+SCRAPE_TARGET_LATENCY = float(os.getenv("SCRAPE_TARGET_LATENCY", "1.0"))  # only ramp up below this response time (s)
+SCRAPE_HTTP_CACHE = os.getenv("SCRAPE_HTTP_CACHE", "1") != "0"  # conditional-GET cache under data/cache/http
+SCRAPE_TEXT_BACKEND = os.getenv("SCRAPE_TEXT_BACKEND", "lxml")   # "lxml" (fast) or "bs4" (reference)
+SCRAPE_ARCHIVE = os.getenv("SCRAPE_ARCHIVE", "1") != "0"           # keep every fetched page in data/raw/archive
+SCRAPE_PARSE_WORKERS = int(os.getenv("SCRAPE_PARSE_WORKERS", "0"))  # parse processes (0 = CPU count)
+SCRAPE_PARSE_QUEUE = int(os.getenv("SCRAPE_PARSE_QUEUE", "0"))      # fetched pages waiting for a parser (0 = 2 x workers)
+SCRAPE_CONNECT_TIMEOUT = float(os.getenv("SCRAPE_CONNECT_TIMEOUT", "5"))    # seconds to establish a connection
+SCRAPE_READ_TIMEOUT = float(os.getenv("SCRAPE_READ_TIMEOUT", "30"))         # seconds to wait for response data
+SCRAPE_RETRIES = int(os.getenv("SCRAPE_RETRIES", "3"))                      # extra attempts on timeouts / 429 / 5xx
+SCRAPE_BACKOFF_BASE = float(os.getenv("SCRAPE_BACKOFF_BASE", "0.5"))        # first retry waits up to this long (doubles)
+SCRAPE_BACKOFF_MAX = float(os.getenv("SCRAPE_BACKOFF_MAX", "20"))           # cap on one retry wait (seconds)
+SCRAPE_BREAKER_THRESHOLD = int(os.getenv("SCRAPE_BREAKER_THRESHOLD", "5"))  # consecutive failures that open a host's circuit
+SCRAPE_BREAKER_COOLDOWN = float(os.getenv("SCRAPE_BREAKER_COOLDOWN", "30")) # seconds before a probe request is allowed
+SCRAPE_CHECKPOINT_BATCH = int(os.getenv("SCRAPE_CHECKPOINT_BATCH", "50"))          # checkpoint records per fsync
+SCRAPE_CHECKPOINT_INTERVAL = float(os.getenv("SCRAPE_CHECKPOINT_INTERVAL", "5"))  # ... or at least every N seconds
+SCRAPE_DEDUP = os.getenv("SCRAPE_DEDUP", "0") == "1"                       # opt-in cross-source dedup of books.csv
+SCRAPE_DEDUP_CAPACITY = int(os.getenv("SCRAPE_DEDUP_CAPACITY", "1000000"))  # keys the Bloom filter is sized for
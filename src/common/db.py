@@ -0,0 +1,156 @@
+"""
+Pooled MySQL connections shared by Task 2 (schema + import) and the Task 4 benchmark.
+
+One pool per MySQL server (host/port/user/... but not the database), created
+on first use and reused by every later call in the process. Connections are
+opened only when a caller needs one and no idle one is left, up to
+DB_POOL_SIZE, so a single-threaded run logs in once; the database is selected
+per checkout (COM_INIT_DB), so schema creation, each import and each
+benchmark query share the same connections.
+
+    with connection("module15_cw1_de_py") as conn:
+        cur = conn.cursor()
+        ...
+
+Idle connections are pinged before they are handed out (dropped ones
+reconnect), and the session is reset when they return to the pool.
+
+Settings (environment / .env): DB_HOST, DB_PORT, DB_USER, DB_PASSWORD,
+DB_POOL_SIZE (most connections per server, default 5), DB_POOL_TIMEOUT
+(seconds to wait for a free connection, default 30).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+import mysql.connector
+from mysql.connector import errors
+
+_pools: dict[tuple, "ConnectionPool"] = {}
+_pools_lock = threading.Lock()
+
+
+def db_settings(**overrides: Any) -> dict[str, Any]:
+    """Server connection arguments from the environment (+ explicit overrides)."""
+    settings: dict[str, Any] = {
+        "host": os.getenv("DB_HOST", "127.0.0.1"),
+        "port": int(os.getenv("DB_PORT", "3306")),
+        "user": os.getenv("DB_USER", "root"),
+        "password": os.getenv("DB_PASSWORD", ""),
+    }
+    settings.update({k: v for k, v in overrides.items() if v is not None})
+    return settings
+
+
+class ConnectionPool:
+    """Connections to one server, opened on demand (at most `size`) and reused."""
+
+    def __init__(self, settings: dict[str, Any], size: int) -> None:
+        self.settings = settings
+        self.size = max(1, size)
+        self.opened = 0
+        self._idle: list[Any] = []
+        self._cond = threading.Condition()
+
+    def get(self, timeout: float) -> Any:
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while not self._idle and self.opened >= self.size:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    raise errors.PoolError(f"No free MySQL connection after {timeout:g}s (DB_POOL_SIZE={self.size})")
+                self._cond.wait(left)
+            conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                self.opened += 1
+        try:
+            if conn is None:
+                return mysql.connector.connect(**self.settings)
+            # Health check: the server may have closed an idle connection (wait_timeout, restart)
+            conn.ping(reconnect=True, attempts=2, delay=0)
+            return conn
+        except BaseException:
+            self._discard()
+            raise
+
+    def put(self, conn: Any) -> None:
+        try:
+            conn.reset_session()
+        except Exception:
+            # Unusable (unread results, dropped): close it and free its slot
+            try:
+                conn.close()
+            except Exception:
+                pass
+            self._discard()
+            return
+        with self._cond:
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def _discard(self) -> None:
+        with self._cond:
+            self.opened -= 1
+            self._cond.notify()
+
+
+class PooledConnection:
+    """A checked-out connection: behaves like the real one, but close() returns it to the pool."""
+
+    def __init__(self, pool: ConnectionPool, conn: Any) -> None:
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name: str) -> Any:
+        if self._conn is None:
+            raise errors.OperationalError("Connection already returned to the pool")
+        return getattr(self._conn, name)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.put(conn)
+
+
+def get_pool(**overrides: Any) -> ConnectionPool:
+    settings = db_settings(**overrides)
+    key = tuple(sorted(settings.items()))
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(settings, int(os.getenv("DB_POOL_SIZE", "5")))
+    return pool
+
+
+def get_connection(database: str | None = None, **overrides: Any) -> PooledConnection:
+    """
+    Check a healthy connection out of the server's pool (close() returns it), with
+    `database` selected if given. Waits up to DB_POOL_TIMEOUT seconds when every
+    connection is in use.
+    """
+    pool = get_pool(**overrides)
+    conn = pool.get(float(os.getenv("DB_POOL_TIMEOUT", "30")))
+    pooled = PooledConnection(pool, conn)
+    if database:
+        try:
+            conn.cmd_init_db(database)
+        except BaseException:
+            pooled.close()
+            raise
+    return pooled
+
+
+@contextmanager
+def connection(database: str | None = None, **overrides: Any) -> Iterator[PooledConnection]:
+    conn = get_connection(database, **overrides)
+    try:
+        yield conn
+    finally:
+        conn.close()
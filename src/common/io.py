@@ -0,0 +1,147 @@
+"""
+Typed book snapshot files shared by Task 1 (writers) and Task 2 / Task 4 (readers).
+
+Next to books.csv the runners write books.parquet with an explicit Arrow
+schema (BOOK_SCHEMA). Loaders read it memory-mapped with the types already
+set, so there is no CSV parsing and no pd.to_numeric pass, and the file is a
+fraction of the CSV size.
+
+Parquet needs the optional `pyarrow` package. Without it, writes are skipped
+and readers fall back to the CSV.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import pandas as pd
+
+from src.common.paths import PROCESSED_DIR
+from src.common.validate import BOOK_COLUMNS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = None
+    pq = None
+
+BOOK_SCHEMA = (
+    pa.schema(
+        [
+            ("title", pa.string()),
+            ("authors", pa.string()),
+            ("year", pa.int16()),
+            ("star_rating", pa.float64()),
+            ("price", pa.float64()),
+            ("source_url", pa.string()),
+        ]
+    )
+    if pa is not None
+    else None
+)
+
+def parquet_available() -> bool:
+    return pa is not None
+
+
+def _books_table(df: pd.DataFrame) -> "pa.Table":
+    df = df.reindex(columns=BOOK_COLUMNS)
+    for col in ("year", "star_rating", "price"):
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return pa.Table.from_pandas(df, schema=BOOK_SCHEMA, preserve_index=False)
+
+
+def write_books_parquet(df: pd.DataFrame, path: Path) -> bool:
+    """Write a book frame as Parquet (zstd). Returns False if pyarrow is not installed."""
+    if pa is None:
+        return False
+    pq.write_table(_books_table(df), str(path), compression="zstd")
+    return True
+
+
+class BookParquetWriter:
+    """Streams row dicts into a Parquet file, one row group per `batch_rows` rows (no-op without pyarrow)."""
+
+    def __init__(self, path: Path, batch_rows: int = 10_000) -> None:
+        self.path = Path(path)
+        self.batch_rows = batch_rows
+        self._rows: list[dict[str, Any]] = []
+        self._writer = None
+        if pa is not None:
+            self._writer = pq.ParquetWriter(str(self.path), BOOK_SCHEMA, compression="zstd")
+
+    @property
+    def enabled(self) -> bool:
+        return self._writer is not None
+
+    def write(self, rows: Iterable[dict[str, Any]]) -> None:
+        if self._writer is None:
+            return
+        self._rows.extend(rows)
+        if len(self._rows) >= self.batch_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._writer is None or not self._rows:
+            return
+        self._writer.write_table(_books_table(pd.DataFrame(self._rows, columns=BOOK_COLUMNS)))
+        self._rows.clear()
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self.flush()
+            self._writer.close()
+            self._writer = None
+
+
+def default_books_path(processed_dir: Path = PROCESSED_DIR) -> Path:
+    """<processed_dir>/books.parquet if it is usable and not older than books.csv, else books.csv."""
+    csv_path = Path(processed_dir) / "books.csv"
+    parquet_path = Path(processed_dir) / "books.parquet"
+    if pa is not None and parquet_path.exists():
+        if not csv_path.exists() or parquet_path.stat().st_mtime >= csv_path.stat().st_mtime:
+            return parquet_path
+    return csv_path
+
+
+def _coerce_csv_types(df: pd.DataFrame) -> pd.DataFrame:
+    for col in ("year", "star_rating", "price"):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    if "year" in df.columns:
+        df["year"] = df["year"].astype("Int64")
+    return df
+
+
+def _require_pyarrow(path: Path) -> None:
+    if pq is None:
+        raise RuntimeError(f"Reading {path} needs pyarrow (pip install pyarrow), or pass the CSV instead")
+
+
+def read_books(path: str | Path) -> pd.DataFrame:
+    """
+    Load a book snapshot (.parquet or .csv): year as Int64, star_rating/price as float64.
+    Parquet is memory-mapped and already typed; CSV columns are coerced.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".parquet":
+        _require_pyarrow(path)
+        table = pq.read_table(str(path), memory_map=True)
+        return table.to_pandas(types_mapper={pa.int16(): pd.Int64Dtype()}.get)
+    return _coerce_csv_types(pd.read_csv(path))
+
+
+def iter_books(path: str | Path, batch_rows: int = 5000) -> Iterator[pd.DataFrame]:
+    """Like read_books, but yields frames of at most `batch_rows` rows (memory stays flat)."""
+    path = Path(path)
+    if path.suffix.lower() == ".parquet":
+        _require_pyarrow(path)
+        pf = pq.ParquetFile(str(path), memory_map=True)
+        for batch in pf.iter_batches(batch_size=batch_rows):
+            yield batch.to_pandas(types_mapper={pa.int16(): pd.Int64Dtype()}.get)
+        return
+    for chunk in pd.read_csv(path, chunksize=batch_rows):
+        yield _coerce_csv_types(chunk)
@@ -0,0 +1,2 @@
+# Columns every Task 1 output file has, in order (Task 2/4 loaders expect the same set)
+BOOK_COLUMNS = ["title", "authors", "year", "star_rating", "price", "source_url"]
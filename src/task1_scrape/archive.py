@@ -0,0 +1,116 @@
+"""
+Content-addressed archive of every page the Task 1 scrapers fetch (WARC-like).
+
+Layout under data/raw/archive/:
+  objects/<xx>/<sha256>.html.zst   page body (zstd if `zstandard` is installed, else .html.gz)
+  index.ndjson                      one line per fetch: url, sha256, codec, size, status, encoding, fetched_at
+
+Identical bodies are stored once; re-fetching an unchanged page only appends
+an index line. `python -m src.task1_scrape.replay` re-parses the archive
+offline.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+try:
+    import zstandard
+except ImportError:  # optional: gzip is used when zstandard is not installed
+    zstandard = None
+
+CODEC_EXT = {"zst": ".html.zst", "gz": ".html.gz"}
+
+
+def compress(body: bytes, codec: str) -> bytes:
+    if codec == "zst":
+        return zstandard.ZstdCompressor(level=10).compress(body)
+    return gzip.compress(body, compresslevel=6)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zst":
+        if zstandard is None:
+            raise RuntimeError("Archive object is zstd-compressed; pip install zstandard to read it")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class PageArchive:
+    def __init__(self, root: Path, codec: str | None = None) -> None:
+        self.root = Path(root)
+        self.codec = codec or ("zst" if zstandard is not None else "gz")
+        self.index_path = self.root / "index.ndjson"
+        self._lock = threading.Lock()
+
+    def object_path(self, sha256: str, codec: str) -> Path:
+        return self.root / "objects" / sha256[:2] / f"{sha256}{CODEC_EXT[codec]}"
+
+    def _find_object(self, sha256: str) -> tuple[Path, str] | None:
+        for codec in CODEC_EXT:
+            path = self.object_path(sha256, codec)
+            if path.exists():
+                return path, codec
+        return None
+
+    def put(self, url: str, body: bytes, status: int = 200, encoding: str | None = None) -> dict[str, Any]:
+        """Store the body (once per distinct content) and append an index record."""
+        sha256 = hashlib.sha256(body).hexdigest()
+
+        found = self._find_object(sha256)
+        if found is None:
+            path = self.object_path(sha256, self.codec)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".tmp{threading.get_ident()}")
+            tmp.write_bytes(compress(body, self.codec))
+            os.replace(tmp, path)
+            codec = self.codec
+        else:
+            codec = found[1]
+
+        record = {
+            "url": url,
+            "sha256": sha256,
+            "codec": codec,
+            "size": len(body),
+            "status": status,
+            "encoding": encoding,
+            "fetched_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with self.index_path.open("a", encoding="utf-8") as f:
+                f.write(line)
+        return record
+
+    def records(self, latest_only: bool = True) -> Iterator[dict[str, Any]]:
+        """Index records in fetch order; with `latest_only`, only the newest fetch of each URL."""
+        if not self.index_path.exists():
+            return
+        latest: dict[str, dict[str, Any]] = {}
+        with self.index_path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                rec = json.loads(line)
+                if latest_only:
+                    latest.pop(rec["url"], None)  # re-insert so dict order follows the newest fetch
+                    latest[rec["url"]] = rec
+                else:
+                    yield rec
+        yield from latest.values()
+
+    def read(self, record: dict[str, Any]) -> bytes:
+        path = self.object_path(record["sha256"], record["codec"])
+        return decompress(path.read_bytes(), record["codec"])
+
+    def read_text(self, record: dict[str, Any]) -> str:
+        return self.read(record).decode(record.get("encoding") or "utf-8", errors="replace")
@@ -0,0 +1,313 @@
+"""
+Task 1 helper: offline scraper benchmark suite (no manning.com / packtpub.com traffic).
+
+Pages come from recorded fixtures (src/task1_scrape/fixtures/*.html, plus
+optionally the page archive in data/raw/archive) and synthetic catalog pages
+with thousands of listings. Stages timed:
+
+  fetch_html             manning fetch_html against a local stand-in HTTP server
+  clean_lines[bs4|lxml]  page -> text lines (outputs must match the bs4 reference)
+  parse_manning_catalog  catalog page -> rows
+  parse_packt_html       product page -> row
+  normalize_authors      raw author strings -> normalized
+
+Each stage reports pages/sec, rows/sec and memory (process peak RSS and the
+stage's peak Python allocation) as JSON, so runs can be diffed before a
+parser change is deployed.
+
+Run (from project root):
+    python -m src.task1_scrape.benchmark
+    python -m src.task1_scrape.benchmark --listings 5000 --repeat 5 --out bench.json
+    python -m src.task1_scrape.benchmark --archive data/raw/archive   # also use real recorded pages
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Iterable
+from urllib.parse import urlsplit
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from src.task1_scrape import fetch
+from src.task1_scrape.archive import PageArchive
+from src.task1_scrape.manning_scraper import TEXT_BACKENDS, _clean_lines, fetch_html, parse_manning_catalog
+from src.task1_scrape.packt_scraper import normalize_authors, parse_packt_html
+from src.task1_scrape.ratelimit import AdaptiveRateLimiter
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+def make_catalog_html(listings: int, seed: int = 42) -> str:
+    """Synthetic catalog page shaped like manning.com/catalog (title, authors, year, prices, rating)."""
+    rnd = random.Random(seed)
+    first = ["Ana", "Ben", "Chen", "Dana", "Eli", "Fatima", "Goran", "Hiro", "Ines", "Jonas"]
+    last = ["Smith", "Garcia", "Okafor", "Tanaka", "Novak", "Rossi", "Berg", "Kim", "Silva", "de Vries"]
+    topics = ["Data Pipelines", "Spark", "Kafka Streams", "dbt", "Airflow", "Lakehouse", "SQL", "Cloud ETL"]
+
+    parts = [
+        "<!DOCTYPE html><html><head><title>Catalog | Manning</title>",
+        "<style>.book{margin:0}</style>",
+        "<script>window.dataLayer=[];function track(){return 1;}</script>",
+        "</head><body>",
+        "<nav><a href='/'>manning.com</a> / <a href='/catalog'>catalog</a> <span>browse</span></nav>",
+        "<div class='sort'>sort: <a>newest</a> <a>popularity</a></div><main>",
+    ]
+    for i in range(listings):
+        n_auth = rnd.randint(1, 3)
+        authors = [f"{rnd.choice(first)} {rnd.choice(last)}" for _ in range(n_auth)]
+        author_html = "<span>,</span>".join(f"<a class='author'>{a}</a>" for a in authors)
+        price = rnd.randint(20, 70) + 0.99
+        rating = f"<span class='rating'>({rnd.randint(1, 40)})</span>" if rnd.random() < 0.6 else ""
+        parts.append(
+            "<div class='book'>"
+            f"<h3><a href='/books/book-{i}'>{rnd.choice(topics)} in Action, Volume {i}</a></h3>"
+            f"<div class='authors'>{author_html}</div>"
+            "<span>,</span>"
+            f"<span class='year'>{rnd.randint(2015, 2025)}</span>"
+            f"<div class='price'><s>${price:.2f}</s> <b>${price / 2:.2f}</b></div>"
+            f"{rating}"
+            "<!-- listing end -->"
+            "</div>"
+        )
+    parts.append("</main><footer>cart | log in</footer></body></html>")
+    return "\n".join(parts)
+
+
+def make_author_strings(count: int, seed: int = 7) -> list[str]:
+    """Raw author strings as they appear on product pages (heavy repetition, mixed separators)."""
+    rnd = random.Random(seed)
+    names = [
+        "Paul Crickard", "Brij Kishore Pandey", "Emily Ro Schoof", "Gareth Eagar", "Manoj Kukreja",
+        "Danil Zburivsky", "Lynda Partner", "Julian de Ruiter", "Jean-Georges Perrin", "Ahmad bin Ali",
+    ]
+    out = []
+    for _ in range(count):
+        picked = rnd.sample(names, rnd.randint(1, 3))
+        sep = rnd.choice([", ", " and ", " "])
+        out.append(sep.join(picked))
+    return out
+
+
+# ---------- corpus ----------
+
+def load_corpus(listings: int, archive_dir: Path | None) -> dict[str, list[tuple[str, str]]]:
+    """(url, html) pairs per source: recorded fixtures (+ archive) and one synthetic big catalog page."""
+    corpus: dict[str, list[tuple[str, str]]] = {"manning": [], "packt": []}
+    for path in sorted(FIXTURES_DIR.glob("*.html")):
+        source = "packt" if path.name.startswith("packt") else "manning"
+        corpus[source].append((f"fixture://{path.name}", path.read_text(encoding="utf-8")))
+
+    if archive_dir is not None:
+        archive = PageArchive(archive_dir)
+        for rec in archive.records():
+            host = urlsplit(rec["url"]).netloc.lower()
+            source = "packt" if host.endswith("packtpub.com") else "manning" if host.endswith("manning.com") else None
+            if source:
+                corpus[source].append((rec["url"], archive.read_text(rec)))
+
+    corpus["manning"].append((f"synthetic://catalog-{listings}", make_catalog_html(listings)))
+    return corpus
+
+
+# ---------- measurement ----------
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_stage(
+    name: str,
+    func: Callable[[Any], int],
+    items: list[Any],
+    repeat: int,
+    pages_per_item: int = 1,
+) -> dict[str, Any]:
+    """
+    Best-of-`repeat` wall time for `func` over all items (func returns rows produced),
+    then one extra pass under tracemalloc for the stage's peak Python allocation.
+    """
+    best = float("inf")
+    rows = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        rows = sum(func(item) for item in items)
+        best = min(best, time.perf_counter() - t0)
+
+    tracemalloc.start()
+    for item in items:
+        func(item)
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    pages = len(items) * pages_per_item
+    result = {
+        "items": len(items),
+        "rows": rows,
+        "seconds": round(best, 6),
+        "pages_per_sec": round(pages / best, 2) if best > 0 and pages_per_item else None,
+        "rows_per_sec": round(rows / best, 2) if best > 0 else None,
+        "peak_rss_mb": _peak_rss_mb(),
+        "py_peak_mb": round(py_peak / (1024 * 1024), 2),
+    }
+    print(
+        f"{name:24s} {best * 1000:10.2f} ms  "
+        f"pages/s={result['pages_per_sec']!s:>9s}  rows/s={result['rows_per_sec']!s:>11s}  "
+        f"py_peak={result['py_peak_mb']} MiB",
+        file=sys.stderr,
+    )
+    return result
+
+
+class _PageServer:
+    """Local stand-in for manning.com: serves the corpus pages over HTTP on 127.0.0.1."""
+
+    def __init__(self, pages: dict[str, bytes]) -> None:
+        pages_ = pages
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:
+                body = pages_.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self) -> "_PageServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@contextlib.contextmanager
+def _quiet() -> Iterable[None]:
+    """Hide the scrapers' per-page [FETCH]/[PARSE] prints while timing."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+# ---------- suite ----------
+
+def run_suite(listings: int, repeat: int, fetch_pages: int, archive_dir: Path | None) -> dict[str, Any]:
+    corpus = load_corpus(listings, archive_dir)
+    manning_pages = corpus["manning"]
+    packt_pages = corpus["packt"]
+    stages: dict[str, Any] = {}
+
+    # Text backends must agree with the bs4 reference before we time them
+    for url, html in manning_pages:
+        reference = _clean_lines(html, backend="bs4")
+        for backend in TEXT_BACKENDS:
+            if _clean_lines(html, backend=backend) != reference:
+                raise AssertionError(f"Backend {backend!r} output differs from the bs4 reference on {url}")
+
+    # fetch_html against a local server (cache/archive/pacing disabled so only HTTP + decode is measured)
+    fixture_bodies = [html.encode("utf-8") for url, html in manning_pages if not url.startswith("synthetic://")]
+    served = {f"/catalog/page-{i}": fixture_bodies[i % len(fixture_bodies)] for i in range(fetch_pages)}
+    saved_cache, saved_archive, saved_limiter = fetch.get_cache(), fetch.get_archive(), fetch.get_limiter()
+    fetch.set_cache(None)
+    fetch.set_archive(None)
+    fetch.set_limiter(AdaptiveRateLimiter(initial_rate=1e9, max_rate=1e9))
+    try:
+        with _PageServer(served) as server, _quiet():
+            urls = [server.base_url + path for path in served]
+            stages["fetch_html"] = run_stage("fetch_html", lambda u: (fetch_html(u), 0)[1], urls, repeat)
+    finally:
+        fetch.set_cache(saved_cache)
+        fetch.set_archive(saved_archive)
+        fetch.set_limiter(saved_limiter)
+
+    htmls = [html for _, html in manning_pages]
+    for backend in TEXT_BACKENDS:
+        # "rows" here are text lines, not books
+        stages[f"clean_lines[{backend}]"] = run_stage(
+            f"clean_lines[{backend}]", lambda h, b=backend: len(_clean_lines(h, backend=b)), htmls, repeat
+        )
+
+    with _quiet():
+        stages["parse_manning_catalog"] = run_stage(
+            "parse_manning_catalog", lambda p: len(parse_manning_catalog(p[1], p[0])), manning_pages, repeat
+        )
+        if packt_pages:
+            stages["parse_packt_html"] = run_stage(
+                "parse_packt_html", lambda p: int(parse_packt_html(p[1], p[0])["title"] is not None), packt_pages, repeat
+            )
+
+    authors = make_author_strings(10_000)
+    stages["normalize_authors"] = run_stage(
+        "normalize_authors", lambda a: int(normalize_authors(a) is not None), authors, repeat, pages_per_item=0
+    )
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": {
+            "manning_pages": len(manning_pages),
+            "packt_pages": len(packt_pages),
+            "synthetic_listings": listings,
+            "fetch_pages": fetch_pages,
+        },
+        "repeat": repeat,
+        "stages": stages,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline Task 1 scraper benchmark (JSON output)")
+    parser.add_argument("--listings", type=int, default=2000, help="Listings on the synthetic catalog page")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes per stage (best is reported)")
+    parser.add_argument("--fetch-pages", type=int, default=200, help="Pages fetched from the local server")
+    parser.add_argument("--archive", type=str, default=None, help="Also benchmark pages recorded in this archive folder")
+    parser.add_argument("--out", type=str, default=None, help="Write the JSON report here (default: stdout)")
+    args = parser.parse_args()
+
+    report = run_suite(
+        listings=args.listings,
+        repeat=args.repeat,
+        fetch_pages=args.fetch_pages,
+        archive_dir=Path(args.archive) if args.archive else None,
+    )
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+        print("Saved:", args.out, file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
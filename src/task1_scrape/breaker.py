@@ -0,0 +1,96 @@
+"""
+Per-host circuit breaker for the Task 1 scrapers.
+
+After `threshold` consecutive transient failures (timeouts, connection errors,
+429/5xx after retries) a host's circuit opens: every queued URL for that host
+fails at once with CircuitOpenError instead of waiting out its own timeouts.
+After `cooldown` seconds one probe request is let through (half-open); if it
+succeeds the circuit closes again, otherwise it re-opens for another cooldown.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from src.common import config
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of a request while the host's circuit is open."""
+
+
+@dataclass
+class HostCircuit:
+    state: str = CLOSED
+    failures: int = 0          # consecutive transient failures
+    opened_at: float = 0.0
+    probing: bool = False      # a half-open probe request is in flight
+    trips: int = 0
+
+
+class CircuitBreaker:
+    def __init__(self, threshold: int | None = None, cooldown: float | None = None) -> None:
+        self.threshold = max(1, threshold or config.SCRAPE_BREAKER_THRESHOLD)
+        self.cooldown = config.SCRAPE_BREAKER_COOLDOWN if cooldown is None else cooldown
+        self._hosts: dict[str, HostCircuit] = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, host: str) -> HostCircuit:
+        circuit = self._hosts.get(host)
+        if circuit is None:
+            circuit = self._hosts[host] = HostCircuit()
+        return circuit
+
+    def before(self, url: str) -> None:
+        """Raise CircuitOpenError if requests to this URL's host should fail fast."""
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            circuit = self._circuit(host)
+            if circuit.state == CLOSED:
+                return
+            if circuit.state == OPEN:
+                left = circuit.opened_at + self.cooldown - time.monotonic()
+                if left > 0:
+                    raise CircuitOpenError(f"{host} circuit open ({left:.0f}s left)")
+                circuit.state = HALF_OPEN
+            if circuit.probing:
+                raise CircuitOpenError(f"{host} circuit half-open (probe in flight)")
+            circuit.probing = True
+
+    def success(self, url: str) -> None:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            circuit = self._circuit(host)
+            if circuit.state != CLOSED:
+                print(f"[BREAKER] {host} closed")
+            circuit.state = CLOSED
+            circuit.failures = 0
+            circuit.probing = False
+
+    def failure(self, url: str) -> None:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            circuit = self._circuit(host)
+            circuit.failures += 1
+            circuit.probing = False
+            if circuit.state == HALF_OPEN or circuit.failures >= self.threshold:
+                if circuit.state != OPEN:
+                    circuit.trips += 1
+                    print(f"[BREAKER] {host} open for {self.cooldown:.0f}s after {circuit.failures} failures")
+                circuit.state = OPEN
+                circuit.opened_at = time.monotonic()
+
+    def release(self, url: str) -> None:
+        """The request ended without saying anything about the host (e.g. a redirect loop): free the probe slot."""
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            self._circuit(host).probing = False
+
+    def state(self, url: str) -> str:
+        with self._lock:
+            return self._circuit(urlsplit(url).netloc.lower()).state
@@ -0,0 +1,146 @@
+"""
+Crash-safe progress journal for long Task 1 runs (data/cache/checkpoint_<source>.ndjson).
+
+One JSON object per line, append-only:
+  {"t": "queued", "url": ...}                           URL added to the crawl frontier
+  {"t": "done", "url": ..., "rows": [...], "links": [...]}  page parsed (row tuples in BOOK_COLUMNS order)
+
+Lines are flushed and fsynced in batches (every `batch` records or `interval`
+seconds), so a crash loses at most one batch of pages. A torn last line is
+ignored on load. `--resume` replays the finished pages from the journal and
+only fetches the URLs that are still open; a run that completes deletes it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+from src.common import config
+from src.common.paths import CACHE_DIR
+
+
+def checkpoint_path(source: str) -> Path:
+    return CACHE_DIR / f"checkpoint_{source}.ndjson"
+
+
+@dataclass
+class CheckpointState:
+    done: dict[str, tuple[list[tuple[Any, ...]], list[str]]] = field(default_factory=dict)  # url -> (rows, links)
+    queued: list[str] = field(default_factory=list)
+
+    @property
+    def frontier(self) -> list[str]:
+        """Queued URLs that never finished (in queue order)."""
+        return [u for u in dict.fromkeys(self.queued) if u not in self.done]
+
+
+def load_checkpoint(path: Path) -> CheckpointState:
+    state = CheckpointState()
+    if not path.exists():
+        return state
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # torn write from a crash
+            if rec.get("t") == "queued":
+                state.queued.append(rec["url"])
+            elif rec.get("t") == "done":
+                state.done[rec["url"]] = ([tuple(r) for r in rec.get("rows", [])], rec.get("links", []))
+    return state
+
+
+def _drop_torn_tail(path: Path) -> None:
+    """Make sure the next record starts on a line of its own after a crash mid-write."""
+    with path.open("rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        pos = size
+        while pos > 0:
+            step = min(4096, pos)
+            f.seek(pos - step)
+            chunk = f.read(step)
+            nl = chunk.rfind(b"\n")
+            if nl != -1:
+                pos = pos - step + nl + 1
+                break
+            pos -= step
+        if pos == size:
+            return
+        f.seek(pos)
+        try:
+            json.loads(f.read())
+        except ValueError:
+            f.truncate(pos)  # torn record (load_checkpoint skipped it too)
+        else:
+            f.write(b"\n")  # complete record, only its newline is missing
+
+
+class CrawlCheckpoint:
+    def __init__(
+        self,
+        path: Path,
+        resume: bool = False,
+        batch: int | None = None,
+        interval: float | None = None,
+    ) -> None:
+        self.path = Path(path)
+        self.batch = max(1, batch or config.SCRAPE_CHECKPOINT_BATCH)
+        self.interval = config.SCRAPE_CHECKPOINT_INTERVAL if interval is None else interval
+        self.state = load_checkpoint(self.path) if resume else CheckpointState()
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def __enter__(self) -> "CrawlCheckpoint":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Resuming appends to the existing journal; a fresh run starts a new one
+        resuming = bool(self.state.done or self.state.queued)
+        if resuming:
+            _drop_torn_tail(self.path)
+        self._file = self.path.open("a" if resuming else "w", encoding="utf-8")
+        if self.state.done:
+            print(
+                f"[CHECKPOINT] resuming: {len(self.state.done)} pages done, "
+                f"{len(self.state.frontier)} still queued ({self.path})"
+            )
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _append(self, rec: dict[str, Any]) -> None:
+        self._file.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._unsynced += 1
+        if self._unsynced >= self.batch or time.monotonic() - self._last_sync >= self.interval:
+            self.sync()
+
+    def sync(self) -> None:
+        if self._file is None or not self._unsynced:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def queued(self, url: str) -> None:
+        self._append({"t": "queued", "url": url})
+
+    def done(self, url: str, rows: Iterable[tuple[Any, ...]], links: Iterable[str] = ()) -> None:
+        self._append({"t": "done", "url": url, "rows": [list(r) for r in rows], "links": list(links)})
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def complete(self) -> None:
+        """The run finished: the journal is no longer needed."""
+        self.close()
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,174 @@
+"""
+Asyncio crawl engine for the Task 1 scrapers.
+
+A fixed pool of workers pulls URLs from a queue. Each host has its own
+concurrency limit, and the blocking page handler (fetch + parse) runs in a
+thread pool that shares one pooled HTTP session (see fetch.py). Throughput
+therefore scales with `concurrency`; the per-host request rate is paced by
+ratelimit.py inside fetch.fetch_bytes().
+
+Usage:
+    def on_result(url, result, error): ...
+    engine = CrawlEngine(handler, on_result, concurrency=8)
+    for url in CATALOG_URLS:
+        engine.add(url)
+    stats = engine.run_sync()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import urlsplit
+
+from src.common import config
+
+Handler = Callable[[str], Any]
+ResultCallback = Callable[[str, Any, Optional[BaseException]], Any]
+
+
+@dataclass
+class CrawlStats:
+    pages: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def pages_per_sec(self) -> float:
+        return self.pages / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"[CRAWL] {self.pages} pages ({self.errors} errors) in {self.elapsed:.2f}s "
+            f"-> {self.pages_per_sec:.2f} pages/sec"
+        )
+
+
+class CrawlEngine:
+    def __init__(
+        self,
+        handler: Handler,
+        on_result: ResultCallback,
+        concurrency: int | None = None,
+        per_host: int | None = None,
+        delay: float | None = None,
+    ) -> None:
+        self.handler = handler
+        self.on_result = on_result
+        self.concurrency = max(1, concurrency or config.SCRAPE_CONCURRENCY)
+        self.per_host = max(1, per_host or config.SCRAPE_PER_HOST)
+        self.delay = config.SCRAPE_DELAY if delay is None else max(0.0, delay)
+
+        self.stats = CrawlStats()
+        self._seen: set[str] = set()
+        self._pending: list[str] = []
+        self._queue: asyncio.Queue[str] | None = None
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+        self._failure: BaseException | None = None
+        self._holds = 0
+        self._released: asyncio.Event | None = None
+
+    def add(self, url: str) -> bool:
+        """Queue a URL once; returns False if it was already seen."""
+        if url in self._seen:
+            return False
+        self._seen.add(url)
+        if self._queue is None:
+            self._pending.append(url)
+        else:
+            self._queue.put_nowait(url)
+        return True
+
+    def mark_seen(self, urls: Iterable[str]) -> None:
+        """Treat URLs as already crawled (e.g. finished in a resumed run); add() will skip them."""
+        self._seen.update(urls)
+
+    def hold(self) -> None:
+        """Keep the crawl alive while a result is still being processed downstream (it may add URLs)."""
+        self._holds += 1
+
+    def release(self) -> None:
+        self._holds -= 1
+        if self._released is not None:
+            self._released.set()
+
+    def fail(self, error: BaseException) -> None:
+        """Stop the crawl with `error` (raised from run())."""
+        if self._failure is None:
+            self._failure = error
+
+    @property
+    def seen(self) -> int:
+        """URLs queued so far (done + in flight + waiting)."""
+        return len(self._seen)
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        sem = self._host_limits.get(host)
+        if sem is None:
+            sem = self._host_limits[host] = asyncio.Semaphore(self.per_host)
+        return sem
+
+    async def _worker(self, executor: ThreadPoolExecutor) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            url = await self._queue.get()
+            try:
+                result, error = None, None
+                async with self._host_limit(url):
+                    try:
+                        result = await loop.run_in_executor(executor, self.handler, url)
+                        self.stats.pages += 1
+                    except Exception as e:
+                        error = e
+                        self.stats.errors += 1
+                    if self.delay:
+                        await asyncio.sleep(self.delay)
+
+                if self._failure is None:
+                    try:
+                        out = self.on_result(url, result, error)
+                        if inspect.isawaitable(out):
+                            await out
+                    except Exception as e:
+                        # A broken result handler (e.g. disk full) must stop the crawl, not be skipped.
+                        self.fail(e)
+            finally:
+                self._queue.task_done()
+
+    async def run(self) -> CrawlStats:
+        self._queue = asyncio.Queue()
+        self._released = asyncio.Event()
+        for url in self._pending:
+            self._queue.put_nowait(url)
+        self._pending.clear()
+
+        t0 = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="crawl")
+        workers = [asyncio.create_task(self._worker(executor)) for _ in range(self.concurrency)]
+        try:
+            # Done when nothing is queued/in flight AND no held result can add more URLs
+            while True:
+                await self._queue.join()
+                if self._holds <= 0 or self._failure is not None:
+                    break
+                self._released.clear()
+                await self._released.wait()
+        finally:
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            executor.shutdown(wait=True)
+            self.stats.elapsed = time.perf_counter() - t0
+
+        if self._failure is not None:
+            raise self._failure
+        return self.stats
+
+    def run_sync(self) -> CrawlStats:
+        return asyncio.run(self.run())
+
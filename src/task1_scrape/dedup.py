@@ -0,0 +1,238 @@
+"""
+Persistent cross-source dedup index for Task 1 listings (data/processed/dedup_index.*).
+
+Every written row claims its keys:
+  t:<normalized title>|<normalized first author>
+  isbn:<13 digits>            (Packt product URLs end in -97Xxxxxxxxxxx)
+
+A row is a duplicate if one of its keys was already claimed in this run, or
+is owned by a *different* source in the history (e.g. a Packt copy of a book
+Manning already listed). Re-scraping the same source is not a duplicate.
+
+History lives in SQLite (key -> source). A Bloom filter saved next to it
+answers "never seen" without touching the database, so checking a new row
+costs a few hash probes, whatever the size of the history. The filter is
+rebuilt from SQLite if it is missing or out of date after a crash, or once
+the history outgrows the capacity it was saved with (each rebuild doubles it).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+import sqlite3
+import struct
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Iterable
+
+from src.common import config
+from src.common.authors import AuthorNormalizer
+from src.common.paths import PROCESSED_DIR
+
+INDEX_PATH = PROCESSED_DIR / "dedup_index.sqlite"
+ISBN_URL_RE = re.compile(r"-(97[89]\d{10})(?:[/?#]|$)")
+NON_WORD_RE = re.compile(r"[^0-9a-z]+")
+
+_authors = AuthorNormalizer()
+
+
+def _norm_key_text(s: Any) -> str:
+    s = unicodedata.normalize("NFKD", str(s or "")).encode("ascii", "ignore").decode("ascii")
+    return NON_WORD_RE.sub(" ", s.casefold()).strip()
+
+
+def isbn_from_url(url: str | None) -> str | None:
+    m = ISBN_URL_RE.search(url or "")
+    return m.group(1) if m else None
+
+
+def title_author_key(row: dict[str, Any]) -> str | None:
+    """`t:<normalized title>|<normalized first author>`: the same book on any page or site (None without a title)."""
+    title = _norm_key_text(row.get("title"))
+    if not title:
+        return None
+    names = _authors.split_names(_authors.normalize(row.get("authors")))
+    return f"t:{title}|{_norm_key_text(names[0]) if names else ''}"
+
+
+def dedup_keys(row: dict[str, Any]) -> list[str]:
+    keys = []
+    key = title_author_key(row)
+    if key:
+        keys.append(key)
+    isbn = isbn_from_url(row.get("source_url"))
+    if isbn:
+        keys.append(f"isbn:{isbn}")
+    return keys
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter (double hashing over one blake2b digest)."""
+
+    _HEADER = struct.Struct("<QIIQ")  # bits, hashes, items recorded in the store when saved, capacity
+
+    def __init__(self, bits: int, hashes: int, capacity: int) -> None:
+        self.bits = bits
+        self.hashes = hashes
+        self.capacity = capacity  # items it was sized for at error_rate
+        self.data = bytearray((bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float) -> "BloomFilter":
+        bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        hashes = max(1, round(bits / capacity * math.log(2)))
+        return cls(bits, hashes, capacity)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        data = self.data
+        for pos in self._positions(key):
+            data[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        data = self.data
+        return all(data[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def save(self, path: Path, items: int) -> None:
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            f.write(self._HEADER.pack(self.bits, self.hashes, items, self.capacity))
+            f.write(self.data)
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> tuple["BloomFilter", int] | None:
+        try:
+            raw = path.read_bytes()
+            bits, hashes, items, capacity = cls._HEADER.unpack_from(raw)
+        except (OSError, struct.error):
+            return None
+        bloom = cls(bits, hashes, capacity)
+        payload = raw[cls._HEADER.size:]
+        if len(payload) != len(bloom.data):
+            return None
+        bloom.data[:] = payload
+        return bloom, items
+
+
+class DedupIndex:
+    def __init__(
+        self,
+        path: Path = INDEX_PATH,
+        capacity: int | None = None,
+        error_rate: float = 0.01,
+        commit_every: int = 1000,
+    ) -> None:
+        self.path = Path(path)
+        self.bloom_path = self.path.with_suffix(".bloom")
+        self.capacity = capacity or config.SCRAPE_DEDUP_CAPACITY
+        self.error_rate = error_rate
+        self.commit_every = commit_every
+        self.counts = {"kept": 0, "dup_in_run": 0, "dup_other_source": 0}
+        self._run_keys: set[str] = set()
+        self._uncommitted = 0
+        self._items = 0
+        self._conn: sqlite3.Connection | None = None
+        self._bloom: BloomFilter | None = None
+
+    def __enter__(self) -> "DedupIndex":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS dedup_keys ("
+            " key TEXT PRIMARY KEY, source TEXT NOT NULL, source_url TEXT, first_seen REAL"
+            ") WITHOUT ROWID"
+        )
+        self._items = self._conn.execute("SELECT COUNT(*) FROM dedup_keys").fetchone()[0]
+
+        # Reuse the saved filter while the history still fits the capacity it was built
+        # for (rebuilds double it, so they get rarer as the history grows)
+        loaded = BloomFilter.load(self.bloom_path)
+        if (
+            loaded is not None
+            and loaded[1] == self._items
+            and max(self._items, self.capacity) <= loaded[0].capacity
+        ):
+            self._bloom = loaded[0]
+            self.capacity = self._bloom.capacity
+        else:
+            self._rebuild_bloom()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _rebuild_bloom(self) -> None:
+        # Grow with the history so the false-positive rate stays near error_rate
+        self.capacity = max(self.capacity, 2 * self._items)
+        self._bloom = BloomFilter.for_capacity(self.capacity, self.error_rate)
+        for (key,) in self._conn.execute("SELECT key FROM dedup_keys"):
+            self._bloom.add(key)
+        print(f"[DEDUP] bloom filter rebuilt from {self._items} keys (capacity {self.capacity})")
+
+    def _owner(self, key: str) -> str | None:
+        if key not in self._bloom:
+            return None  # definitely never seen: no database read
+        row = self._conn.execute("SELECT source FROM dedup_keys WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def claim(self, row: dict[str, Any], source: str) -> str | None:
+        """
+        Record the row if it is new. Returns None for a new row, otherwise why it is a
+        duplicate: "run" (already written this run) or the source that owns it.
+        """
+        keys = dedup_keys(row)
+        if any(k in self._run_keys for k in keys):
+            self.counts["dup_in_run"] += 1
+            return "run"
+        for k in keys:
+            owner = self._owner(k)
+            if owner is not None and owner != source:
+                self.counts["dup_other_source"] += 1
+                return owner
+
+        self._run_keys.update(keys)
+        now = time.time()
+        for k in keys:
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO dedup_keys (key, source, source_url, first_seen) VALUES (?, ?, ?, ?)",
+                (k, source, row.get("source_url"), now),
+            )
+            if cur.rowcount:
+                self._bloom.add(k)
+                self._items += 1
+                self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self._commit()
+        self.counts["kept"] += 1
+        return None
+
+    def is_duplicate(self, row: dict[str, Any], source: str) -> bool:
+        return self.claim(row, source) is not None
+
+    def _commit(self) -> None:
+        self._conn.commit()
+        self._bloom.save(self.bloom_path, self._items)
+        self._uncommitted = 0
+
+    def close(self) -> None:
+        if self._conn is None:
+            return
+        self._commit()
+        self._conn.close()
+        self._conn = None
+        c = self.counts
+        print(
+            f"[DEDUP] kept={c['kept']} dup_in_run={c['dup_in_run']} "
+            f"dup_other_source={c['dup_other_source']} index_keys={self._items}"
+        )
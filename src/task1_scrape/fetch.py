@@ -0,0 +1,178 @@
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.common import config
+from src.common.paths import CACHE_DIR, RAW_DIR
+from src.task1_scrape.archive import PageArchive
+from src.task1_scrape.http_cache import HttpCache
+from src.task1_scrape.breaker import CircuitBreaker
+from src.task1_scrape.ratelimit import BACKOFF_STATUSES, AdaptiveRateLimiter
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+_cache: HttpCache | None = HttpCache(CACHE_DIR / "http") if config.SCRAPE_HTTP_CACHE else None
+_archive: PageArchive | None = PageArchive(RAW_DIR / "archive") if config.SCRAPE_ARCHIVE else None
+_limiter = AdaptiveRateLimiter()
+_breaker = CircuitBreaker()
+
+
+def get_session() -> requests.Session:
+    """One pooled session shared by every scraper thread (keeps TCP/TLS connections alive)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                pool_size = max(config.SCRAPE_CONCURRENCY, config.SCRAPE_PER_HOST)
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def get_cache() -> HttpCache | None:
+    return _cache
+
+
+def get_archive() -> PageArchive | None:
+    return _archive
+
+
+def get_limiter() -> AdaptiveRateLimiter:
+    return _limiter
+
+
+def set_limiter(limiter: AdaptiveRateLimiter) -> None:
+    """Replace the per-host rate limiter (e.g. with runner flags applied)."""
+    global _limiter
+    _limiter = limiter
+
+
+def set_cache(cache: HttpCache | None) -> None:
+    """Swap the response cache (None disables it), e.g. for benchmarks."""
+    global _cache
+    _cache = cache
+
+
+def set_archive(archive: PageArchive | None) -> None:
+    """Swap the page archive (None disables it), e.g. for benchmarks."""
+    global _archive
+    _archive = archive
+
+
+Timeout = float | tuple[float, float]
+
+# Worth another attempt: the server or the network may do better next time
+TRANSIENT_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.ContentDecodingError,
+)
+
+
+def default_timeout() -> tuple[float, float]:
+    """(connect, read) timeouts from config."""
+    return config.SCRAPE_CONNECT_TIMEOUT, config.SCRAPE_READ_TIMEOUT
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(max, base * 2^attempt))."""
+    return random.uniform(0.0, min(config.SCRAPE_BACKOFF_MAX, config.SCRAPE_BACKOFF_BASE * 2 ** attempt))
+
+
+def fetch_text(url: str, headers: dict[str, str], timeout: Timeout | None = None) -> str:
+    body, encoding = fetch_bytes(url, headers, timeout=timeout)
+    return body.decode(encoding or "utf-8", errors="replace")
+
+
+def fetch_bytes(
+    url: str,
+    headers: dict[str, str],
+    timeout: Timeout | None = None,
+    retries: int | None = None,
+) -> tuple[bytes, str | None]:
+    """
+    Raw body + its text encoding (paced per host; goes through the HTTP cache and the page archive).
+
+    Timeouts, connection errors, broken/undecodable bodies and 429/5xx are retried `retries` times with jittered
+    exponential backoff. Other HTTP errors are raised at once. While the host's circuit
+    is open, CircuitOpenError is raised without sending anything.
+    """
+    timeout = timeout if timeout is not None else default_timeout()
+    retries = config.SCRAPE_RETRIES if retries is None else retries
+
+    entry = _cache.lookup(url) if _cache else None
+    if entry is not None:
+        headers = {**headers, **entry.validators()}
+
+    attempt = 0
+    while True:
+        _breaker.before(url)
+        _limiter.acquire(url)
+        t0 = time.perf_counter()
+        try:
+            r = get_session().get(url, headers=headers, timeout=timeout)
+        except requests.RequestException as e:
+            if not isinstance(e, TRANSIENT_ERRORS):
+                # Redirect loop, bad URL...: this URL fails, the host is not to blame
+                _breaker.release(url)
+                raise
+            _limiter.record(url, None, time.perf_counter() - t0)
+            _breaker.failure(url)
+            error: Exception = e
+            print(f"[FETCH] {type(e).__name__} {url}")
+        except BaseException:
+            _breaker.release(url)
+            raise
+        else:
+            _limiter.record(url, r.status_code, time.perf_counter() - t0, r.headers.get("Retry-After"))
+            print(f"[FETCH] {r.status_code} {url}")
+            if r.status_code not in BACKOFF_STATUSES:
+                _breaker.success(url)
+                break
+            _breaker.failure(url)
+            error = requests.HTTPError(f"{r.status_code} {r.reason} for url: {url}", response=r)
+
+        if attempt >= retries:
+            raise error
+        attempt += 1
+        wait = backoff_delay(attempt)
+        print(f"[RETRY] {attempt}/{retries} in {wait:.1f}s {url}")
+        time.sleep(wait)
+
+    if r.status_code == 304 and entry is not None:
+        body = entry.body()
+        encoding = entry.meta.get("encoding")
+        _cache.record_hit(served=len(body))
+    else:
+        r.raise_for_status()
+        body = r.content
+        encoding = r.encoding or r.apparent_encoding
+        if _cache is not None:
+            _cache.record_miss(downloaded=len(body))
+            _cache.store(url, body, r.headers, encoding)
+
+    if _archive is not None:
+        _archive.put(url, body, status=r.status_code, encoding=encoding)
+    return body, encoding
+
+
+def print_rate_stats() -> None:
+    _limiter.print_stats()
+
+
+def print_cache_stats() -> None:
+    if _cache is None:
+        return
+    s = _cache.stats
+    print(
+        f"[CACHE] hits={s.hits} misses={s.misses} "
+        f"downloaded={s.bytes_downloaded / 1024:.1f} KiB served_from_cache={s.bytes_served / 1024:.1f} KiB"
+    )
@@ -0,0 +1,126 @@
+"""
+Incremental change detection for Task 1 snapshots.
+
+A fingerprint store (data/processed/fingerprints_<source>.json) maps each
+listing key (normalized title + first author, so a book listed on several
+catalog pages is one listing whichever page it was kept from) to a hash of
+its normalized title/authors/year/price/rating plus the page it was last
+seen on. Every scrape compares its rows against the store and writes a delta
+next to the full snapshot:
+
+  data/processed/books_delta.csv   BOOK_COLUMNS + change (insert / update / delete)
+
+Deletes are only emitted for listings whose source page was fetched
+successfully in this run, so a failed page never looks like a mass delete.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable
+
+from src.common.validate import BOOK_COLUMNS
+from src.task1_scrape.dedup import title_author_key
+
+DELTA_COLUMNS = BOOK_COLUMNS + ["change"]
+
+
+def _norm_text(v: Any) -> str:
+    return " ".join(str(v).split()).lower() if v is not None else ""
+
+
+def _norm_num(v: Any, fmt: str) -> str:
+    try:
+        return format(float(v), fmt) if v is not None and v == v else ""
+    except (TypeError, ValueError):
+        return ""
+
+
+def listing_key(row: dict[str, Any]) -> str:
+    return title_author_key(row) or f"u:{row.get('source_url') or ''}"
+
+
+def listing_fingerprint(row: dict[str, Any]) -> str:
+    parts = [
+        _norm_text(row.get("title")),
+        _norm_text(row.get("authors")),
+        _norm_num(row.get("year"), ".0f"),
+        _norm_num(row.get("price"), ".2f"),
+        _norm_num(row.get("star_rating"), ".1f"),
+    ]
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class ChangeTracker:
+    def __init__(self, store_path: Path, delta_path: Path) -> None:
+        self.store_path = Path(store_path)
+        self.delta_path = Path(delta_path)
+        self.counts = {"insert": 0, "update": 0, "delete": 0, "unchanged": 0}
+        # key -> [fingerprint, source_url, title]
+        self._previous: dict[str, list[str]] = {}
+        self._current: dict[str, list[str]] = {}
+        self._file = None
+        self._writer = None
+
+    def __enter__(self) -> "ChangeTracker":
+        if self.store_path.exists():
+            self._previous = json.loads(self.store_path.read_text(encoding="utf-8"))
+            if any(not isinstance(v, list) for v in self._previous.values()):
+                print(f"[DELTA] {self.store_path.name} uses the old (source_url, title) keys; starting a new store")
+                self._previous = {}
+        self._file = self.delta_path.open("w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=DELTA_COLUMNS, extrasaction="ignore")
+        self._writer.writeheader()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def observe(self, row: dict[str, Any]) -> str:
+        """Record one snapshot row; returns its change type."""
+        key = listing_key(row)
+        fp = listing_fingerprint(row)
+        self._current[key] = [fp, row.get("source_url") or "", str(row.get("title") or "").strip()]
+
+        prev = self._previous.get(key)
+        change = "insert" if prev is None else ("unchanged" if prev[0] == fp else "update")
+        self.counts[change] += 1
+        if change != "unchanged":
+            self._writer.writerow({**row, "change": change})
+        return change
+
+    def finish(self, fetched_urls: Iterable[str] | None) -> dict[str, int]:
+        """
+        Emit deletes for previously-seen listings missing from this run, limited to
+        `fetched_urls` (pages parsed successfully). Pass None when the snapshot is
+        partial (e.g. a row limit was hit) to skip deletes. Then save the store.
+        """
+        store = dict(self._previous)
+        if fetched_urls is not None:
+            fetched = set(fetched_urls)
+            for key, (_, source_url, title) in self._previous.items():
+                if key in self._current:
+                    continue
+                if source_url in fetched:
+                    del store[key]
+                    self._writer.writerow({"title": title, "source_url": source_url, "change": "delete"})
+                    self.counts["delete"] += 1
+        store.update(self._current)
+        self._file.flush()
+
+        tmp = self.store_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(store, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self.store_path)
+
+        c = self.counts
+        print(
+            f"[DELTA] insert={c['insert']} update={c['update']} delete={c['delete']} "
+            f"unchanged={c['unchanged']} -> {self.delta_path}"
+        )
+        return dict(self.counts)
@@ -0,0 +1,123 @@
+"""
+Persistent HTTP response cache for the Task 1 scrapers.
+
+Each URL is stored as two files under data/cache/http/<xx>/:
+  <sha256(url)>.html.gz   gzip-compressed response body
+  <sha256(url)>.json      ETag / Last-Modified / encoding / fetch time
+
+fetch.fetch_text() sends If-None-Match / If-Modified-Since from the stored
+validators; a 304 reply is served from disk, so unchanged pages cost a few
+hundred bytes instead of the full HTML.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0              # 304 Not Modified -> served from disk
+    misses: int = 0            # no usable entry, or the page changed (200)
+    bytes_downloaded: int = 0  # body bytes received from the network
+    bytes_served: int = 0      # body bytes served from the cache
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes_downloaded": self.bytes_downloaded,
+            "bytes_served": self.bytes_served,
+        }
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    body_path: Path
+    meta: dict[str, Any]
+
+    def validators(self) -> dict[str, str]:
+        headers = {}
+        if self.meta.get("etag"):
+            headers["If-None-Match"] = self.meta["etag"]
+        if self.meta.get("last_modified"):
+            headers["If-Modified-Since"] = self.meta["last_modified"]
+        return headers
+
+    def body(self) -> bytes:
+        with gzip.open(self.body_path, "rb") as f:
+            return f.read()
+
+    def text(self) -> str:
+        return self.body().decode(self.meta.get("encoding") or "utf-8", errors="replace")
+
+
+class HttpCache:
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.stats = CacheStats()
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        folder = self.root / key[:2]
+        return folder / f"{key}.html.gz", folder / f"{key}.json"
+
+    def lookup(self, url: str) -> CacheEntry | None:
+        body_path, meta_path = self._paths(url)
+        if not (body_path.exists() and meta_path.exists()):
+            return None
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        # Without a validator we cannot revalidate, so the entry is useless
+        if meta.get("url") != url or not (meta.get("etag") or meta.get("last_modified")):
+            return None
+        return CacheEntry(url=url, body_path=body_path, meta=meta)
+
+    def store(self, url: str, body: bytes, headers: Any, encoding: str | None) -> None:
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not (etag or last_modified):
+            return
+
+        body_path, meta_path = self._paths(url)
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to temp files first so a crash never leaves a half-written entry
+        tmp_body = body_path.with_suffix(f".tmp{threading.get_ident()}")
+        with gzip.open(tmp_body, "wb", compresslevel=6) as f:
+            f.write(body)
+        os.replace(tmp_body, body_path)
+
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "encoding": encoding,
+            "size": len(body),
+            "fetched_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        tmp_meta = meta_path.with_suffix(f".tmp{threading.get_ident()}")
+        tmp_meta.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp_meta, meta_path)
+
+    def record_hit(self, served: int) -> None:
+        with self.stats._lock:
+            self.stats.hits += 1
+            self.stats.bytes_served += served
+
+    def record_miss(self, downloaded: int) -> None:
+        with self.stats._lock:
+            self.stats.misses += 1
+            self.stats.bytes_downloaded += downloaded
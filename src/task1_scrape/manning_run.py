@@ -1,47 +1,148 @@
-import time
-import pandas as pd
+import argparse
+from contextlib import nullcontext
 
+from src.common import config
+from src.common.io import parquet_available
 from src.common.paths import RAW_DIR, PROCESSED_DIR
+from src.task1_scrape.checkpoint import CrawlCheckpoint, checkpoint_path
+from src.task1_scrape.dedup import DedupIndex
+from src.task1_scrape.fetch import print_cache_stats, print_rate_stats, set_limiter
+from src.task1_scrape.fingerprints import ChangeTracker
+from src.task1_scrape.pipeline import ScrapePipeline, rows_as_dicts
+from src.task1_scrape.ratelimit import AdaptiveRateLimiter
+from src.task1_scrape.sink import CsvRowSink
 from src.task1_scrape.sources import CATALOG_URLS
-from src.task1_scrape.manning_scraper import scrape_catalog
+from src.task1_scrape.manning_scraper import canonical_catalog_url
 
 
 
 def main() -> None:
-    all_rows = []
-    for i, url in enumerate(CATALOG_URLS, start=1):
-        print(f"\n=== CATALOG {i}/{len(CATALOG_URLS)} ===")
-        try:
-            all_rows.extend(scrape_catalog(url))
-        except Exception as e:
-            print("[SKIP] error:", repr(e))
-        time.sleep(1)
-
-    df = pd.DataFrame(all_rows)
-
-    if df.empty:
-        print("\n[ERROR] No rows scraped. Try adding more Manning catalog URLs.")
-        return
-
-    df = (
-        df.dropna(subset=["title", "authors", "year", "price"])
-          .drop_duplicates(subset=["title"])
-          .reset_index(drop=True)
+    parser = argparse.ArgumentParser(description="Task 1: scrape Manning catalog pages -> CSV")
+    parser.add_argument("--concurrency", type=int, default=config.SCRAPE_CONCURRENCY, help="Pages fetched at once")
+    parser.add_argument("--per-host", type=int, default=config.SCRAPE_PER_HOST, help="Pages fetched at once per host")
+    parser.add_argument("--delay", type=float, default=config.SCRAPE_DELAY, help="Extra fixed pause after each page per worker (seconds)")
+    parser.add_argument("--rate", type=float, default=config.SCRAPE_RATE, help="Starting requests/sec per host (adapts to the server)")
+    parser.add_argument("--max-rate", type=float, default=config.SCRAPE_RATE_MAX, help="Upper bound for the adaptive per-host rate")
+    parser.add_argument("--parse-workers", type=int, default=None, help="Parse processes (default: CPU count)")
+    parser.add_argument(
+        "--discover",
+        action="store_true",
+        help="Follow pagination + sub-category links from the seed CATALOG_URLS (whole catalog)",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Stop writing after N books (default: 15, or no limit with --discover; 0 = no limit)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its checkpoint (finished pages are not fetched again)",
     )
+    args = parser.parse_args()
+    set_limiter(AdaptiveRateLimiter(initial_rate=args.rate, max_rate=args.max_rate))
 
-    # Ensure at least 15 rows
-    df_15 = df.head(15).copy()
+    limit = args.limit if args.limit is not None else (0 if args.discover else 15)
+    seeds = [canonical_catalog_url(u) for u in CATALOG_URLS]
+    scopes = seeds if args.discover else None
 
     raw_path = RAW_DIR / "books_manning_raw.csv"
     processed_path = PROCESSED_DIR / "books.csv"
+    parquet_path = PROCESSED_DIR / "books.parquet"
+    delta_path = PROCESSED_DIR / "books_delta.csv"
+
+    with CrawlCheckpoint(checkpoint_path("manning"), resume=args.resume) as checkpoint, ChangeTracker(
+        PROCESSED_DIR / "fingerprints_manning.json", delta_path
+    ) as tracker, (DedupIndex() if config.SCRAPE_DEDUP else nullcontext()) as dedup, CsvRowSink(
+        [processed_path],
+        raw_paths=[raw_path],
+        required=("title", "authors", "year", "price"),
+        limit=limit,
+        on_row=tracker.observe,
+        parquet_path=parquet_path,
+        dedup=(lambda row: dedup.is_duplicate(row, "manning")) if dedup else None,
+    ) as sink:
+        done = 0
+        fetched_urls: list[str] = []  # pages parsed OK (only their listings can count as deleted)
+        # Fixed seed list: hold pages and write them in seed order, so the output (and which rows
+        # fit under --limit) does not depend on which page finished first. --discover streams.
+        pending: dict[str, tuple] | None = None if args.discover else {}
+
+        def add(url):
+            if pipeline.add(url):
+                checkpoint.queued(url)
+
+        def write_page(url, rows, links):
+            fetched_urls.append(url)
+            # Rows go straight to disk; nothing accumulates in memory
+            written = sink.write(rows_as_dicts(rows))
+            print(f"[PARSE] {len(rows)} rows from catalog -> [SINK] +{written} (total {sink.written})")
+            if not sink.full:
+                for link in links:
+                    add(link)
 
-    df_15.to_csv(raw_path, index=False)
-    df_15.to_csv(processed_path, index=False)
+        def take_page(url, rows, links):
+            if pending is None:
+                write_page(url, rows, links)
+            else:
+                pending[url] = (rows, links)
+
+        def on_page(url, rows, links, error):
+            nonlocal done
+            done += 1
+            print(f"\n=== CATALOG {done}/{pipeline.engine.seen} === {url}")
+            if error is not None:
+                print("[SKIP] error:", repr(error))
+                return
+            checkpoint.done(url, rows, links)
+            take_page(url, rows, links)
+
+        pipeline = ScrapePipeline(
+            "manning",
+            on_page,
+            scopes=scopes,
+            concurrency=args.concurrency,
+            per_host=args.per_host,
+            delay=args.delay,
+            parse_workers=args.parse_workers,
+        )
+
+        # Resume: rebuild the CSVs from the finished pages, then crawl only what is left
+        resumed = checkpoint.state
+        pipeline.mark_seen(resumed.done)
+        for url, (rows, links) in resumed.done.items():
+            take_page(url, rows, links)
+        for url in resumed.frontier + seeds:
+            add(url)
+        pipeline.run_sync()
+        if pending is not None:
+            for url in dict.fromkeys(seeds + list(pending)):
+                if url in pending:
+                    write_page(url, *pending.pop(url))
+
+        # A run cut short by --limit is a partial snapshot: report inserts/updates only
+        tracker.finish(None if sink.full else fetched_urls)
+    checkpoint.complete()
+
+    print_rate_stats()
+    print_cache_stats()
+
+    if sink.written == 0:
+        print("\n[ERROR] No rows scraped. Try adding more Manning catalog URLs (or use --discover).")
+        return
 
-    print("\n[DF] shape:", df_15.shape)
-    print("[DF] columns:", df_15.columns.tolist())
+    print("\n[ROWS] written:", sink.written)
+    if sink.deduped:
+        print(f"[DEDUP] {sink.deduped} rows owned by another source left out of {processed_path.name} (kept in RAW)")
+    print("[ROWS] columns:", sink.columns)
     print("Saved RAW:", raw_path)
     print("Saved PROCESSED:", processed_path)
+    if parquet_available():
+        print("Saved PARQUET:", parquet_path)
+    else:
+        print("[PARQUET] skipped (pip install pyarrow to also write books.parquet)")
+    print("Saved DELTA:", delta_path)
 
 
 if __name__ == "__main__":
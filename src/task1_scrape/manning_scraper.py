@@ -1,8 +1,13 @@
 import re
-from typing import Any, Optional
+from array import array
+from dataclasses import dataclass
+from html import unescape
+from typing import Any, Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
 
-import requests
-from bs4 import BeautifulSoup
+from src.common import config
+from src.task1_scrape.fetch import Timeout, fetch_text
+from src.task1_scrape.text_extract import lines_bs4, lines_lxml
 
 BASE_URL = "https://www.manning.com"
 
@@ -21,6 +26,8 @@ HEADERS = {
 YEAR_RE = re.compile(r"^(19|20)\d{2}$")                 # year is a standalone line like "2025"
 PRICE_LINE_RE = re.compile(r"^([$£€])\s*([0-9]+(?:\.[0-9]{2})?)$")  # price on its own line like "$47.99"
 RATINGCOUNT_RE = re.compile(r"\(\s*(\d+)\s*\)")  # matches "(4)", "( 4 )", "(4 reviews)" etc.
+HREF_RE = re.compile(r"""<a\b[^>]*?\bhref\s*=\s*["']([^"'#]+)""", re.IGNORECASE)
+PAGINATION_PARAMS = {"page", "p"}  # the only query params that lead to new listings
 
 # Lines to ignore as "not titles"
 NOISE = {
@@ -67,17 +74,20 @@ def _dbg_print_row(
     print("=" * 70)
 
 
-def fetch_html(url: str, timeout: int = 30) -> str:
-    r = requests.get(url, headers=HEADERS, timeout=timeout)
-    print(f"[FETCH] {r.status_code} {url}")
-    r.raise_for_status()
-    return r.text
+def fetch_html(url: str, timeout: Timeout | None = None) -> str:
+    return fetch_text(url, headers=HEADERS, timeout=timeout)
 
 
-def _clean_lines(html: str) -> list[str]:
-    soup = BeautifulSoup(html, "html.parser")
-    lines = [ln.strip() for ln in soup.get_text("\n", strip=True).split("\n")]
-    return [ln for ln in lines if ln]
+TEXT_BACKENDS = {"bs4": lines_bs4, "lxml": lines_lxml}
+
+
+def _clean_lines(html: str, backend: Optional[str] = None) -> list[str]:
+    backend = backend or config.SCRAPE_TEXT_BACKEND
+    try:
+        extract = TEXT_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown text backend {backend!r}. Use one of: {sorted(TEXT_BACKENDS)}") from None
+    return extract(html)
 
 
 def _is_noise(line: str) -> bool:
@@ -134,6 +144,88 @@ def _looks_like_title(line: str) -> bool:
     return True
 
 
+# Line tags computed once per page by _classify_lines() (bit flags, one byte per line)
+TAG_NOISE = 1          # _is_noise (includes "," / "|" separators)
+TAG_YEAR = 2           # _is_year_line
+TAG_PRICE = 4          # _is_price_line
+TAG_RATING_START = 8   # _is_ratingcount_line (count at the start of the line)
+TAG_RATING_ANY = 16    # RATINGCOUNT_RE.search() hits anywhere in the line
+TAG_TITLE = 32         # _looks_like_title
+
+# YEAR_RE / PRICE_LINE_RE / RATINGCOUNT_RE (start) folded into one pattern; at most one branch can match
+LINE_RE = re.compile(
+    r"(?P<year>(?:19|20)\d{2})$"
+    r"|[$£€]\s*(?P<price>[0-9]+(?:\.[0-9]{2})?)$"
+    r"|\(\s*(?P<count>\d+)\s*\)"
+)
+SEPARATORS = {",", "|"}
+
+
+@dataclass
+class LineIndex:
+    """Per-line tags and values, plus 'next line with tag X' pointers for O(1) look-ahead."""
+    tags: array
+    prices: array       # price value where TAG_PRICE is set
+    counts: array       # rating count where TAG_RATING_ANY is set
+    next_year: array    # next_year[i] = first j >= i tagged TAG_YEAR (n if none)
+    next_rating: array  # next_rating[i] = first j >= i tagged TAG_RATING_ANY (n if none)
+
+
+def _classify_lines(lines: list[str]) -> LineIndex:
+    n = len(lines)
+    tags = array("B", bytes(n))
+    prices = array("d", bytes(8 * n))
+    counts = array("d", bytes(8 * n))
+
+    # Hot loop: bind globals to locals
+    line_match = LINE_RE.match
+    count_search = RATINGCOUNT_RE.search
+    noise_lower = NOISE_LOWER
+    separators = SEPARATORS
+    not_title = TAG_NOISE | TAG_YEAR | TAG_PRICE | TAG_RATING_START
+
+    for i, raw in enumerate(lines):
+        s = raw.strip()
+        tag = TAG_NOISE if (s in separators or s.lower() in noise_lower) else 0
+
+        m = line_match(s)
+        if m is not None:
+            kind = m.lastgroup
+            if kind == "year":
+                tag |= TAG_YEAR
+            elif kind == "price":
+                tag |= TAG_PRICE
+                prices[i] = float(m.group("price"))
+            else:
+                tag |= TAG_RATING_START | TAG_RATING_ANY
+                counts[i] = float(m.group("count"))
+        elif "(" in s:
+            rm = count_search(s)
+            if rm is not None:
+                tag |= TAG_RATING_ANY
+                counts[i] = float(rm.group(1))
+
+        # Titles: long enough, not noise/year/price/count, and not a single nav word
+        # (isalpha() is only true for one word of letters, same as the split() check)
+        if not tag & not_title and len(s) >= 6 and not s.isalpha():
+            tag |= TAG_TITLE
+        tags[i] = tag
+
+    next_year = array("l", [n]) * (n + 1)
+    next_rating = array("l", [n]) * (n + 1)
+    ny = nr = n
+    for i in range(n - 1, -1, -1):
+        tag = tags[i]
+        if tag & TAG_YEAR:
+            ny = i
+        elif tag & TAG_RATING_ANY:
+            nr = i
+        next_year[i] = ny
+        next_rating[i] = nr
+
+    return LineIndex(tags=tags, prices=prices, counts=counts, next_year=next_year, next_rating=next_rating)
+
+
 def parse_manning_catalog(html: str, catalog_url: str) -> list[dict[str, Any]]:
     """
     Parse Manning catalog pages where listing info is split across lines:
@@ -144,8 +236,13 @@ def parse_manning_catalog(html: str, catalog_url: str) -> list[dict[str, Any]]:
       $47.99
       $23.99
       (4)
+
+    Every line is classified once (_classify_lines), then the listing state
+    machine below only reads tags, so parse time is linear in the page size.
     """
-    lines = _clean_lines(html)
+    lines = [ln.strip() for ln in _clean_lines(html)]
+    index = _classify_lines(lines)
+    tags = index.tags
 
     rows: list[dict[str, Any]] = []
     seen_titles = set()
@@ -154,51 +251,36 @@ def parse_manning_catalog(html: str, catalog_url: str) -> list[dict[str, Any]]:
     n = len(lines)
 
     while i < n:
-        line = lines[i].strip()
-
-        if not _looks_like_title(line):
+        if not tags[i] & TAG_TITLE:
             i += 1
             continue
 
-        title = line
+        title = lines[i]
 
-        # Look ahead for a year within the next few lines
-        # We expect: author lines + optional comma line + year
-        year_idx = None
-        for j in range(i + 1, min(i + 8, n)):  # look ahead up to 7 lines
-            if _is_year_line(lines[j]):
-                year_idx = j
-                break
-
-        if year_idx is None:
+        # Year must appear within the next 7 lines (author lines + optional comma line + year)
+        year_idx = index.next_year[i + 1]
+        if year_idx >= min(i + 8, n):
             i += 1
             continue
 
         # Authors are the lines between title and year, excluding commas/noise
-        author_parts = []
-        for k in range(i + 1, year_idx):
-            part = lines[k].strip()
-            if part in {",", "|"}:
-                continue
-            if _is_noise(part) or _is_price_line(part) or _is_ratingcount_line(part) or _is_year_line(part):
-                continue
-            author_parts.append(part)
+        skip = TAG_NOISE | TAG_PRICE | TAG_RATING_START | TAG_YEAR
+        author_parts = [lines[k] for k in range(i + 1, year_idx) if not tags[k] & skip]
 
         authors = " ".join(author_parts).strip() if author_parts else None
-        year = int(lines[year_idx].strip())
+        year = int(lines[year_idx])
 
         # After year, gather next 1–4 price lines (often 1 or 2 lines: full + discounted)
         prices: list[float] = []
         p_scan_end = min(year_idx + 6, n)
         idx = year_idx + 1
         while idx < p_scan_end:
-            p = _price_value(lines[idx])
-            if p is not None:
-                prices.append(p)
+            if tags[idx] & TAG_PRICE:
+                prices.append(index.prices[idx])
                 idx += 1
                 continue
             # stop price scan if we hit next title-ish thing
-            if _looks_like_title(lines[idx]) and idx > year_idx + 1:
+            if tags[idx] & TAG_TITLE and idx > year_idx + 1:
                 break
             idx += 1
 
@@ -208,18 +290,13 @@ def parse_manning_catalog(html: str, catalog_url: str) -> list[dict[str, Any]]:
 
         price = prices[-1]  # pick latest/discounted if multiple
 
-        # Rating count is OPTIONAL and its position can vary.
-        # Sometimes it appears immediately after the prices, but other times there may be
-        # extra lines (e.g., a stray "1" or layout text) before "(4)".
-        # We'll scan a small window after the prices and pick the first match.
+        # Rating count is OPTIONAL and its position can vary (sometimes a stray "1" or
+        # layout text sits between the prices and "(4)"), so take the first count
+        # within 14 lines after the year.
         star_rating = None
-        rating_scan_start = year_idx + 1
-        rating_scan_end = min(year_idx + 15, n)
-        for r_i in range(rating_scan_start, rating_scan_end):
-            m = RATINGCOUNT_RE.search(lines[r_i])
-            if m:
-                star_rating = float(m.group(1))  # review count shown in parentheses
-                break
+        r_i = index.next_rating[year_idx + 1]
+        if r_i < min(year_idx + 15, n):
+            star_rating = index.counts[r_i]  # review count shown in parentheses
 
         # Final validation
         if not authors:
@@ -245,7 +322,6 @@ def parse_manning_catalog(html: str, catalog_url: str) -> list[dict[str, Any]]:
                 lines=lines,
             )
 
-    
         rows.append({
             "title": title,
             "authors": authors,
@@ -261,6 +337,40 @@ def parse_manning_catalog(html: str, catalog_url: str) -> list[dict[str, Any]]:
     return rows
 
 
+def canonical_catalog_url(url: str) -> str:
+    """Lower-case host, no trailing slash/fragment, only pagination query params kept."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k.lower() in PAGINATION_PARAMS]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), ""))
+
+
+def extract_catalog_links(html: str, page_url: str, scopes: Iterable[str]) -> list[str]:
+    """
+    Catalog links worth following from this page: pagination (?page=N) and
+    sub-category pages. Only URLs on the same host whose path sits under one
+    of the `scopes` (the seed catalog paths) are kept, so the crawl never
+    wanders into book/detail pages or other sections of the site.
+    """
+    base = urlsplit(page_url)
+    scope_paths = [urlsplit(u).path.rstrip("/") for u in scopes]
+
+    out: list[str] = []
+    seen = set()
+    for href in HREF_RE.findall(html):
+        url = canonical_catalog_url(urljoin(page_url, unescape(href.strip())))
+        parts = urlsplit(url)
+        if parts.netloc != base.netloc.lower() or parts.scheme not in {"http", "https"}:
+            continue
+        if not any(parts.path == sp or parts.path.startswith(sp + "/") for sp in scope_paths):
+            continue
+        if url not in seen:
+            seen.add(url)
+            out.append(url)
+    return out
+
+
+
 def scrape_catalog(url: str) -> list[dict[str, Any]]:
     html = fetch_html(url)
     rows = parse_manning_catalog(html, catalog_url=url)
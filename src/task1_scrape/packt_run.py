@@ -1,35 +1,109 @@
-import time
+import argparse
 import pandas as pd
 
+from src.common import config
+from src.common.io import write_books_parquet
 from src.common.paths import RAW_DIR, PROCESSED_DIR
+from src.common.validate import BOOK_COLUMNS
+from src.task1_scrape.checkpoint import CrawlCheckpoint, checkpoint_path
+from src.task1_scrape.dedup import DedupIndex
+from src.task1_scrape.fetch import print_cache_stats, print_rate_stats, set_limiter
+from src.task1_scrape.fingerprints import ChangeTracker
+from src.task1_scrape.pipeline import ScrapePipeline, rows_as_dicts
+from src.task1_scrape.ratelimit import AdaptiveRateLimiter
 from src.task1_scrape.sources import BOOK_URLS
-from src.task1_scrape.packt_scraper import parse_packt_product
 
 
 def main() -> None:
-    rows = []
-    for i, url in enumerate(BOOK_URLS, start=1):
-        print(f"\n=== {i}/{len(BOOK_URLS)} ===")
-        try:
-            row = parse_packt_product(url)
+    parser = argparse.ArgumentParser(description="Task 1: scrape Packt product pages -> CSV")
+    parser.add_argument("--concurrency", type=int, default=config.SCRAPE_CONCURRENCY, help="Pages fetched at once")
+    parser.add_argument("--per-host", type=int, default=config.SCRAPE_PER_HOST, help="Pages fetched at once per host")
+    parser.add_argument("--delay", type=float, default=config.SCRAPE_DELAY, help="Extra fixed pause after each page per worker (seconds)")
+    parser.add_argument("--rate", type=float, default=config.SCRAPE_RATE, help="Starting requests/sec per host (adapts to the server)")
+    parser.add_argument("--max-rate", type=float, default=config.SCRAPE_RATE_MAX, help="Upper bound for the adaptive per-host rate")
+    parser.add_argument("--parse-workers", type=int, default=None, help="Parse processes (default: CPU count)")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its checkpoint (finished pages are not fetched again)",
+    )
+    args = parser.parse_args()
+    set_limiter(AdaptiveRateLimiter(initial_rate=args.rate, max_rate=args.max_rate))
+
+    results: dict[str, dict] = {}
+    done = 0
+
+    with CrawlCheckpoint(checkpoint_path("packt"), resume=args.resume) as checkpoint:
+
+        def on_page(url, rows, links, error):
+            nonlocal done
+            done += 1
+            print(f"\n=== {done}/{len(BOOK_URLS)} === {url}")
+            if error is not None:
+                print("[SKIP] error:", repr(error))
+                return
+            checkpoint.done(url, rows)
+            row = rows_as_dicts(rows)[0]
             print("[PARSED]", row)
-            rows.append(row)
-        except Exception as e:
-            print("[SKIP] error:", repr(e))
-        time.sleep(1)
+            results[url] = row
+
+        pipeline = ScrapePipeline(
+            "packt",
+            on_page,
+            concurrency=args.concurrency,
+            per_host=args.per_host,
+            delay=args.delay,
+            parse_workers=args.parse_workers,
+        )
 
-    df = pd.DataFrame(rows).dropna(subset=["title"]).drop_duplicates(subset=["title"]).reset_index(drop=True)
+        # Resume: keep the rows of finished pages, fetch only the rest
+        for url, (rows, _) in checkpoint.state.done.items():
+            results[url] = rows_as_dicts(rows)[0]
+        done = len(results)
+        pipeline.mark_seen(results)
+        for url in BOOK_URLS:
+            if pipeline.add(url):
+                checkpoint.queued(url)
+        pipeline.run_sync()
+    print_rate_stats()
+    print_cache_stats()
+
+    rows = [results[url] for url in BOOK_URLS if url in results]
+
+    rows = [r for r in rows if r.get("title") is not None]
+    df = pd.DataFrame(rows, columns=BOOK_COLUMNS).drop_duplicates(subset=["title"]).reset_index(drop=True)
+    records = df.astype(object).where(df.notna(), None).to_dict(orient="records")
+    processed_df = df
+    if config.SCRAPE_DEDUP:
+        # books.csv leaves out books another source (Manning) already owns; the raw file keeps them
+        with DedupIndex() as dedup:
+            keep = [not dedup.is_duplicate(r, "packt") for r in records]
+        processed_df = df[keep].reset_index(drop=True)
 
     # Save raw and processed (for now they’re the same, but later we can clean further in processed)
     raw_path = RAW_DIR / "books_packt.csv"
     processed_path = PROCESSED_DIR / "books.csv"
 
     df.to_csv(raw_path, index=False)
-    df.to_csv(processed_path, index=False)
+    processed_df.to_csv(processed_path, index=False)
+    parquet_path = PROCESSED_DIR / "books.parquet"
+    wrote_parquet = write_books_parquet(processed_df, parquet_path)
+
+    delta_path = PROCESSED_DIR / "books_delta.csv"
+    with ChangeTracker(PROCESSED_DIR / "fingerprints_packt.json", delta_path) as tracker:
+        for row in records:
+            tracker.observe(row)
+        tracker.finish(fetched_urls=list(results))
+    checkpoint.complete()
 
     print("\n[DF] shape:", df.shape)
     print("Saved RAW:", raw_path)
     print("Saved PROCESSED:", processed_path)
+    if wrote_parquet:
+        print("Saved PARQUET:", parquet_path)
+    else:
+        print("[PARQUET] skipped (pip install pyarrow to also write books.parquet)")
+    print("Saved DELTA:", delta_path)
 
 
 if __name__ == "__main__":
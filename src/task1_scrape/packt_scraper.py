@@ -2,9 +2,16 @@ import json
 import re
 from typing import Any
 
-import requests
 from bs4 import BeautifulSoup
 
+from src.common.authors import AuthorNormalizer
+from src.task1_scrape.fetch import Timeout, fetch_text
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON-LD decoding
+    orjson = None
+
 HEADERS = {
     "User-Agent": "Mozilla/5.0",
     "Accept-Language": "en-GB,en;q=0.9",
@@ -13,36 +20,76 @@ HEADERS = {
 PUBDATE_RE = re.compile(r"Publication date\s*:?\s*([A-Za-z]{3,9}\s+\d{1,2},\s+\d{4})", re.IGNORECASE)
 PRICE_RE = re.compile(r"\$([0-9]+(?:\.[0-9]{2})?)")
 YEAR_RE = re.compile(r"(19|20)\d{2}")
+# <script type="application/ld+json">...</script> straight from the raw HTML (type value is case-sensitive, like the CSS selector)
+LD_JSON_RE = re.compile(
+    r"""<(?i:script)\b[^>]*?\b(?i:type)\s*=\s*["']?application/ld\+json\b["']?[^>]*>(.*?)</(?i:script)\s*>""",
+    re.DOTALL,
+)
 
 BAD_AUTHOR_PHRASES = [
     "free trial", "unsubscribe", "emails", "redeeming", "service",
     "privacy", "terms", "cookie", "newsletter", "consent"
 ]
 
+# Memoized author parsing (author strings repeat across pages); also interns names -> ids
+AUTHORS = AuthorNormalizer(BAD_AUTHOR_PHRASES)
+
 
-def fetch_html(url: str, timeout: int = 30) -> str:
-    r = requests.get(url, headers=HEADERS, timeout=timeout)
-    print(f"[FETCH] {r.status_code} {url}")
-    r.raise_for_status()
-    return r.text
+def fetch_html(url: str, timeout: Timeout | None = None) -> str:
+    return fetch_text(url, headers=HEADERS, timeout=timeout)
 
 
-def extract_jsonld(soup: BeautifulSoup) -> list[dict[str, Any]]:
+def _loads_json(raw: str) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # orjson is stricter (e.g. NaN, huge ints); let the stdlib decide
+    return json.loads(raw)
+
+
+def extract_jsonld_raw(html: str) -> list[dict[str, Any]]:
+    """JSON-LD blocks (dicts) of a page, read from the raw HTML without building a DOM."""
     blocks: list[dict[str, Any]] = []
-    for tag in soup.select('script[type="application/ld+json"]'):
-        if not tag.string:
+    for m in LD_JSON_RE.finditer(html):
+        raw = m.group(1)
+        if not raw:
             continue
         try:
-            data = json.loads(tag.string)
-            if isinstance(data, list):
-                blocks.extend([d for d in data if isinstance(d, dict)])
-            elif isinstance(data, dict):
-                blocks.append(data)
+            data = _loads_json(raw)
         except json.JSONDecodeError:
             continue
+        if isinstance(data, list):
+            blocks.extend([d for d in data if isinstance(d, dict)])
+        elif isinstance(data, dict):
+            blocks.append(data)
     return blocks
 
 
+class LazyDom:
+    """BeautifulSoup tree and its text, built on first use and at most once per page."""
+
+    def __init__(self, html: str) -> None:
+        self.html = html
+        self._soup: BeautifulSoup | None = None
+        self._strings: list[str] | None = None
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.html, "html.parser")
+        return self._soup
+
+    def _stripped_strings(self) -> list[str]:
+        if self._strings is None:
+            self._strings = list(self.soup.stripped_strings)
+        return self._strings
+
+    def text(self, separator: str) -> str:
+        """Equivalent to soup.get_text(separator, strip=True), from one cached traversal."""
+        return separator.join(self._stripped_strings())
+
+
 def pick_product_ld(jsonlds: list[dict[str, Any]]) -> dict[str, Any] | None:
     for d in jsonlds:
         t = d.get("@type")
@@ -89,36 +136,13 @@ def extract_person_names_from_jsonld(jsonlds: list[dict[str, Any]]) -> list[str]
 
 
 def is_probably_author_string(s: str) -> bool:
-    if not s:
-        return False
-
-    s_clean = " ".join(s.split()).strip()
-    if len(s_clean) > 80:
-        return False
-
-    low = s_clean.lower()
-    if any(p in low for p in BAD_AUTHOR_PHRASES):
-        return False
-
-    if not re.search(r"[A-Za-z]", s_clean):
-        return False
-
-    if s_clean.count(".") >= 1 or s_clean.count(",") > 6:
-        return False
-
-    name_like = re.fullmatch(
-        r"[A-Za-z][A-Za-z .'-]*(?:, [A-Za-z][A-Za-z .'-]*)*(?: and [A-Za-z][A-Za-z .'-]*)?",
-        s_clean
-    )
-    if name_like:
-        return True
+    return AUTHORS.is_author_string(s)
 
-    caps_words = re.findall(r"\b[A-Z][a-z]+(?:'[A-Za-z]+)?\b", s_clean)
-    return len(caps_words) >= 2
 
-
-def extract_authors_fallback(soup: BeautifulSoup) -> str | None:
-    text_lines = soup.get_text("\n", strip=True).split("\n")
+def extract_authors_fallback(soup: BeautifulSoup, text: str | None = None) -> str | None:
+    if text is None:
+        text = soup.get_text("\n", strip=True)
+    text_lines = text.split("\n")
 
     for line in text_lines[:250]:
         line = " ".join(line.split()).strip()
@@ -145,8 +169,9 @@ def extract_authors_fallback(soup: BeautifulSoup) -> str | None:
     return None
 
 
-def extract_rating_fallback(soup: BeautifulSoup) -> float | None:
-    text = soup.get_text(" ", strip=True)
+def extract_rating_fallback(soup: BeautifulSoup, text: str | None = None) -> float | None:
+    if text is None:
+        text = soup.get_text(" ", strip=True)
 
     hotspots = ["rating", "ratings", "review", "reviews", "stars", "star"]
     for h in hotspots:
@@ -174,66 +199,32 @@ def extract_rating_fallback(soup: BeautifulSoup) -> float | None:
 
 
 def normalize_authors(authors: str | None) -> str | None:
-    if not authors:
-        return None
-
-    s = " ".join(authors.split()).strip()
-
-    if "," in s:
-        parts = [p.strip() for p in s.split(",") if p.strip()]
-        return ", ".join(parts) if parts else None
-
-    s = re.sub(r"\s+\band\b\s+", ", ", s, flags=re.IGNORECASE)
-
-    tokens = s.split()
-    if len(tokens) <= 2:
-        return s
-
-    chunks: list[str] = []
-    current: list[str] = [tokens[0]]
-
-    def is_new_name_start(word: str) -> bool:
-        connectors = {"de", "da", "del", "van", "von", "bin", "binti", "al", "el", "la", "le", "di", "du"}
-        if word.lower() in connectors:
-            return False
-        if not word[:1].isupper():
-            return False
-        return len(current) >= 2
-
-    for w in tokens[1:]:
-        if is_new_name_start(w):
-            chunks.append(" ".join(current))
-            current = [w]
-        else:
-            current.append(w)
-
-    if current:
-        chunks.append(" ".join(current))
+    return AUTHORS.normalize(authors)
 
-    if len(chunks) <= 1:
-        return s
 
-    return ", ".join(chunks)
+def _h1_title(dom: LazyDom) -> str | None:
+    h1 = dom.soup.select_one("h1")
+    return h1.get_text(strip=True) if h1 else None
 
 
-def parse_packt_product(url: str) -> dict[str, Any]:
-    html = fetch_html(url)
-    soup = BeautifulSoup(html, "html.parser")
-    text = soup.get_text("\n", strip=True)
-
-    h1 = soup.select_one("h1")
-    title = h1.get_text(strip=True) if h1 else None
+def parse_packt_html(html: str, url: str) -> dict[str, Any]:
+    """
+    Fast path: the JSON-LD Product block is read straight from the raw HTML.
+    The BeautifulSoup tree (LazyDom) is only built if a field is still missing.
+    """
+    dom = LazyDom(html)
 
-    jsonlds = extract_jsonld(soup)
+    jsonlds = extract_jsonld_raw(html)
     product = pick_product_ld(jsonlds)
 
+    title = None
     authors = None
     year = None
     star_rating = None
     price = None
 
     if product:
-        title = product.get("name") or title
+        title = product.get("name")
 
         a = product.get("author")
         if isinstance(a, dict):
@@ -279,7 +270,11 @@ def parse_packt_product(url: str) -> dict[str, Any]:
                     except ValueError:
                         pass
 
+    if not title:
+        title = _h1_title(dom)
+
     if year is None:
+        text = dom.text("\n")
         m = PUBDATE_RE.search(text)
         if m:
             ym = YEAR_RE.search(m.group(1))
@@ -291,12 +286,12 @@ def parse_packt_product(url: str) -> dict[str, Any]:
                 year = int(ym.group(0))
 
     if price is None:
-        pm = PRICE_RE.search(text)
+        pm = PRICE_RE.search(dom.text("\n"))
         if pm:
             price = float(pm.group(1))
 
     if authors is None:
-        authors = extract_authors_fallback(soup)
+        authors = extract_authors_fallback(dom.soup, text=dom.text("\n"))
 
     if authors is None:
         person_names = extract_person_names_from_jsonld(jsonlds)
@@ -304,7 +299,7 @@ def parse_packt_product(url: str) -> dict[str, Any]:
             authors = ", ".join(person_names[:5])
 
     if star_rating is None:
-        star_rating = extract_rating_fallback(soup)
+        star_rating = extract_rating_fallback(dom.soup, text=dom.text(" "))
 
     authors = normalize_authors(authors)
 
@@ -316,3 +311,7 @@ def parse_packt_product(url: str) -> dict[str, Any]:
         "price": price,
         "source_url": url,
     }
+
+
+def parse_packt_product(url: str) -> dict[str, Any]:
+    return parse_packt_html(fetch_html(url), url)
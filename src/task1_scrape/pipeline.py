@@ -0,0 +1,159 @@
+"""
+Two-stage scrape pipeline: network fetch stage -> process-pool parse stage.
+
+    CrawlEngine workers (threads, I/O)  --raw bytes-->  bounded queue  -->  ProcessPoolExecutor (parse)
+                                                                                    |
+    on_page(url, rows, links, error)  <----------  plain row tuples + links  -------+
+
+BeautifulSoup/lxml parsing holds the GIL, so it runs in worker processes and
+scales with the number of cores. When the parsers fall behind, the bounded
+queue fills up and the fetch workers wait (backpressure) instead of piling
+pages up in memory.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Optional
+
+from src.common import config
+from src.common.validate import BOOK_COLUMNS
+from src.task1_scrape import manning_scraper, packt_scraper
+from src.task1_scrape.crawl import CrawlEngine, CrawlStats
+from src.task1_scrape.fetch import fetch_bytes
+
+RowTuple = tuple[Any, ...]  # values in BOOK_COLUMNS order
+PageCallback = Callable[[str, Optional[list[RowTuple]], list[str], Optional[BaseException]], Any]
+
+
+def _as_tuples(rows: Iterable[dict[str, Any]]) -> list[RowTuple]:
+    return [tuple(r.get(c) for c in BOOK_COLUMNS) for r in rows]
+
+
+def parse_manning_bytes(body: bytes, encoding: str | None, url: str, scopes=None) -> tuple[list[RowTuple], list[str]]:
+    html = body.decode(encoding or "utf-8", errors="replace")
+    rows = manning_scraper.parse_manning_catalog(html, catalog_url=url)
+    links = manning_scraper.extract_catalog_links(html, url, scopes) if scopes else []
+    return _as_tuples(rows), links
+
+
+def parse_packt_bytes(body: bytes, encoding: str | None, url: str, scopes=None) -> tuple[list[RowTuple], list[str]]:
+    html = body.decode(encoding or "utf-8", errors="replace")
+    return _as_tuples([packt_scraper.parse_packt_html(html, url)]), []
+
+
+def sample_manning_lines(body: bytes, encoding: str | None, limit: int = 60) -> list[str]:
+    """First text lines of a catalog page, to see why the parser found no rows."""
+    html = body.decode(encoding or "utf-8", errors="replace")
+    return manning_scraper._clean_lines(html)[:limit]
+
+
+# source -> (request headers, parse function run in the worker processes, zero-row diagnostic or None)
+SOURCES = {
+    "manning": (manning_scraper.HEADERS, parse_manning_bytes, sample_manning_lines),
+    "packt": (packt_scraper.HEADERS, parse_packt_bytes, None),
+}
+
+
+def parse_page(parse_fn, sample_fn, body: bytes, encoding: str | None, url: str, scopes=None):
+    """Worker-process job: parse one page, plus the diagnostic sample lines when it has no rows."""
+    rows, links = parse_fn(body, encoding, url, scopes)
+    sample = sample_fn(body, encoding) if not rows and sample_fn is not None else []
+    return rows, links, sample
+
+
+def rows_as_dicts(rows: Iterable[RowTuple]) -> list[dict[str, Any]]:
+    return [dict(zip(BOOK_COLUMNS, r)) for r in rows]
+
+
+class ScrapePipeline:
+    def __init__(
+        self,
+        source: str,
+        on_page: PageCallback,
+        scopes: Optional[list[str]] = None,
+        concurrency: int | None = None,
+        per_host: int | None = None,
+        delay: float | None = None,
+        parse_workers: int | None = None,
+        queue_size: int | None = None,
+    ) -> None:
+        self.headers, self.parse_fn, self.sample_fn = SOURCES[source]
+        self.on_page = on_page
+        self.scopes = scopes
+        self.parse_workers = parse_workers or config.SCRAPE_PARSE_WORKERS or os.cpu_count() or 1
+        self.queue_size = queue_size or config.SCRAPE_PARSE_QUEUE or 2 * self.parse_workers
+        self.engine = CrawlEngine(
+            self._fetch,
+            self._on_fetched,
+            concurrency=concurrency,
+            per_host=per_host,
+            delay=delay,
+        )
+        self.pages_parsed = 0
+        self.rows_parsed = 0
+        self._pages: asyncio.Queue | None = None
+
+    def add(self, url: str) -> bool:
+        return self.engine.add(url)
+
+    def mark_seen(self, urls: Iterable[str]) -> None:
+        self.engine.mark_seen(urls)
+
+    def _fetch(self, url: str) -> tuple[bytes, str | None]:
+        return fetch_bytes(url, self.headers)
+
+    async def _on_fetched(self, url: str, page, error: Optional[BaseException]) -> None:
+        if error is not None:
+            self.on_page(url, None, [], error)
+            return
+        # Hold the crawl open until this page is parsed: parsing may discover more URLs
+        self.engine.hold()
+        await self._pages.put((url, page))  # blocks the fetch worker when the queue is full
+
+    async def _parse_worker(self, pool: ProcessPoolExecutor) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            url, (body, encoding) = await self._pages.get()
+            try:
+                try:
+                    rows, links, lines = await loop.run_in_executor(
+                        pool, parse_page, self.parse_fn, self.sample_fn, body, encoding, url, self.scopes
+                    )
+                except Exception as e:
+                    self.on_page(url, None, [], e)
+                else:
+                    self.pages_parsed += 1
+                    self.rows_parsed += len(rows)
+                    self.on_page(url, rows, links, None)
+                    if lines:
+                        print(f"[DEBUG] no rows from {url}; sample lines (first {len(lines)}):")
+                        for ln in lines:
+                            print("  ", ln)
+            except Exception as e:
+                self.engine.fail(e)
+            finally:
+                self._pages.task_done()
+                self.engine.release()
+
+    async def run(self) -> CrawlStats:
+        self._pages = asyncio.Queue(maxsize=self.queue_size)
+        with ProcessPoolExecutor(max_workers=self.parse_workers) as pool:
+            parsers = [asyncio.create_task(self._parse_worker(pool)) for _ in range(self.parse_workers)]
+            try:
+                return await self.engine.run()
+            finally:
+                for p in parsers:
+                    p.cancel()
+                await asyncio.gather(*parsers, return_exceptions=True)
+
+    def run_sync(self) -> CrawlStats:
+        stats = asyncio.run(self.run())
+        print(stats.summary())
+        print(
+            f"[PARSE] {self.pages_parsed} pages -> {self.rows_parsed} rows "
+            f"({self.parse_workers} processes, queue {self.queue_size})"
+        )
+        return stats
@@ -0,0 +1,147 @@
+"""
+Adaptive per-host request rate for the Task 1 scrapers (replaces the fixed 1 s sleep).
+
+Each host gets its own paced token bucket whose rate is steered AIMD-style
+from the responses:
+
+  fast 2xx/3xx (latency < target)  rate += step          (additive increase)
+  slow 2xx/3xx                     rate unchanged
+  429 / 5xx / connection error     rate *= backoff       (multiplicative decrease)
+  Retry-After: N                   no requests to the host for N seconds
+
+The rate stays within [min_rate, max_rate] requests/sec. fetch.fetch_bytes()
+calls acquire() before every request and record() after it. snapshot() exposes
+the current rate and queue depth (threads waiting for a slot) per host.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any
+from urllib.parse import urlsplit
+
+from src.common import config
+
+BACKOFF_STATUSES = {429, 500, 502, 503, 504}
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Retry-After header -> seconds to wait (delta-seconds or HTTP-date form)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class HostRate:
+    rate: float                 # allowed requests/sec right now
+    next_slot: float = 0.0      # monotonic time of the next free request slot
+    blocked_until: float = 0.0  # Retry-After embargo (monotonic)
+    waiting: int = 0            # threads currently queued for a slot
+    requests: int = 0
+    backoffs: int = 0
+    last_latency: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "rate": round(self.rate, 3),
+            "queue_depth": self.waiting,
+            "requests": self.requests,
+            "backoffs": self.backoffs,
+            "last_latency": round(self.last_latency, 3),
+        }
+
+
+class AdaptiveRateLimiter:
+    def __init__(
+        self,
+        initial_rate: float | None = None,
+        min_rate: float | None = None,
+        max_rate: float | None = None,
+        target_latency: float | None = None,
+        step: float = 0.25,
+        backoff: float = 0.5,
+    ) -> None:
+        self.min_rate = min_rate if min_rate is not None else config.SCRAPE_RATE_MIN
+        self.max_rate = max(self.min_rate, max_rate if max_rate is not None else config.SCRAPE_RATE_MAX)
+        initial = initial_rate if initial_rate is not None else config.SCRAPE_RATE
+        self.initial_rate = min(self.max_rate, max(self.min_rate, initial))
+        self.target_latency = target_latency if target_latency is not None else config.SCRAPE_TARGET_LATENCY
+        self.step = step
+        self.backoff = backoff
+        self._hosts: dict[str, HostRate] = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url: str) -> HostRate:
+        host = urlsplit(url).netloc.lower()
+        state = self._hosts.get(host)
+        if state is None:
+            with self._lock:
+                state = self._hosts.setdefault(host, HostRate(rate=self.initial_rate))
+        return state
+
+    def acquire(self, url: str) -> float:
+        """Block until the host has a free request slot; returns the seconds waited."""
+        state = self._host(url)
+        waited = 0.0
+        with state._lock:
+            state.waiting += 1
+        try:
+            while True:
+                with state._lock:
+                    now = time.monotonic()
+                    slot = max(now, state.next_slot, state.blocked_until)
+                    if slot <= now:
+                        state.next_slot = now + 1.0 / state.rate
+                        state.requests += 1
+                        return waited
+                    pause = slot - now
+                # Sleep outside the lock and re-check: the rate or a Retry-After may change meanwhile
+                time.sleep(pause)
+                waited += pause
+        finally:
+            with state._lock:
+                state.waiting -= 1
+
+    def record(self, url: str, status: int | None, latency: float, retry_after: str | None = None) -> None:
+        """Feed back one response (status None = connection error / timeout)."""
+        state = self._host(url)
+        with state._lock:
+            state.last_latency = latency
+            if status is None or status in BACKOFF_STATUSES:
+                old = state.rate
+                state.rate = max(self.min_rate, state.rate * self.backoff)
+                state.backoffs += 1
+                delay = parse_retry_after(retry_after)
+                if delay:
+                    state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+                # Re-pace the queue at the lower rate
+                state.next_slot = max(state.next_slot, time.monotonic() + 1.0 / state.rate)
+                host = urlsplit(url).netloc
+                wait = f" retry_after={delay:.1f}s" if delay else ""
+                print(f"[RATE] {host} status={status} rate {old:.2f} -> {state.rate:.2f} req/s{wait}")
+            elif latency < self.target_latency:
+                state.rate = min(self.max_rate, state.rate + self.step)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Per-host metrics: current rate, queue depth, requests, backoffs, last latency."""
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {host: state.as_dict() for host, state in hosts.items()}
+
+    def print_stats(self) -> None:
+        for host, m in self.snapshot().items():
+            print(
+                f"[RATE] {host} rate={m['rate']:.2f} req/s queue={m['queue_depth']} "
+                f"requests={m['requests']} backoffs={m['backoffs']}"
+            )
@@ -0,0 +1,105 @@
+"""
+Task 1 helper: re-parse the archived pages (data/raw/archive) without touching the network.
+
+After changing a heuristic in parse_manning_catalog / parse_packt_html, run
+this to rebuild the CSV from every archived page. Pages are decompressed and
+parsed in a process pool, so the job is CPU-bound (no politeness delays).
+
+Run (from project root):
+    python -m src.task1_scrape.replay --source manning
+    python -m src.task1_scrape.replay --source packt --workers 8 --out data/processed/books.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+from src.common.paths import RAW_DIR
+from src.task1_scrape.archive import PageArchive
+from src.task1_scrape.pipeline import SOURCES as PARSERS, rows_as_dicts
+from src.task1_scrape.sink import CsvRowSink
+
+ARCHIVE_DIR = RAW_DIR / "archive"
+
+SOURCES = {
+    # source: (host suffix, required columns for a usable row)
+    "manning": ("manning.com", ("title", "authors", "year", "price")),
+    "packt": ("packtpub.com", ("title",)),
+}
+
+
+def _replay_one(job: tuple[str, str, dict[str, Any]]) -> tuple[str, list[dict[str, Any]], str | None]:
+    """Process-pool worker: read + decompress + parse one archived page."""
+    root, source, record = job
+    try:
+        body = PageArchive(Path(root)).read(record)
+        _, parse_fn, _ = PARSERS[source]
+        rows, _ = parse_fn(body, record.get("encoding"), record["url"])
+        return record["url"], rows_as_dicts(rows), None
+    except Exception as e:
+        return record["url"], [], repr(e)
+
+
+def replay(
+    source: str,
+    out_path: Path,
+    archive_dir: Path = ARCHIVE_DIR,
+    workers: int | None = None,
+    all_versions: bool = False,
+) -> int:
+    host_suffix, required = SOURCES[source]
+    archive = PageArchive(archive_dir)
+    records = [
+        r for r in archive.records(latest_only=not all_versions)
+        if urlsplit(r["url"]).netloc.lower().endswith(host_suffix) and r.get("status") in (200, 304)
+    ]
+    if not records:
+        print(f"[REPLAY] no archived {source} pages in {archive_dir}")
+        return 0
+
+    workers = workers or os.cpu_count() or 1
+    print(f"[REPLAY] {len(records)} {source} pages, {workers} worker processes")
+
+    t0 = time.perf_counter()
+    pages = errors = 0
+    with CsvRowSink([out_path], required=required) as sink, ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = ((str(archive_dir), source, r) for r in records)
+        for url, rows, error in pool.map(_replay_one, jobs, chunksize=8):
+            if error is not None:
+                errors += 1
+                print(f"[SKIP] {url} error: {error}")
+                continue
+            pages += 1
+            sink.write(rows)
+    elapsed = time.perf_counter() - t0
+
+    print(
+        f"[REPLAY] {pages} pages ({errors} errors) -> {sink.written} rows in {elapsed:.2f}s "
+        f"({pages / elapsed if elapsed else 0:.1f} pages/sec)"
+    )
+    print("Saved:", out_path)
+    return sink.written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-parse archived Task 1 pages offline")
+    parser.add_argument("--source", choices=sorted(SOURCES), default="manning")
+    parser.add_argument("--archive", type=str, default=None, help="Archive folder (default: data/raw/archive)")
+    parser.add_argument("--out", type=str, default=None, help="Output CSV (default: data/raw/books_<source>_replay.csv)")
+    parser.add_argument("--workers", type=int, default=None, help="Parse processes (default: CPU count)")
+    parser.add_argument("--all-versions", action="store_true", help="Replay every archived fetch, not just the newest per URL")
+    args = parser.parse_args()
+
+    out_path = Path(args.out) if args.out else RAW_DIR / f"books_{args.source}_replay.csv"
+    archive_dir = Path(args.archive) if args.archive else ARCHIVE_DIR
+    replay(args.source, out_path, archive_dir=archive_dir, workers=args.workers, all_versions=args.all_versions)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import csv
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+from src.common.io import BookParquetWriter
+from src.common.validate import BOOK_COLUMNS
+
+
+class CsvRowSink:
+    """
+    Streams parsed rows to one or more CSV files as they arrive (header first, flushed per batch).
+
+    Applies the same cleaning the runners used to do on the final DataFrame:
+    rows missing a `required` field are dropped, duplicates (by `key`) are dropped,
+    and writing stops after `limit` rows. Only the seen keys are kept in memory.
+    `dedup` (optional) is an extra filter for `paths` and `parquet_path` only: called per
+    row, True = leave it out (e.g. DedupIndex.is_duplicate, which also remembers rows
+    across runs and sources). `raw_paths` and `on_row` still get every row, so the raw
+    file and the change tracker stay complete for this source.
+    `on_row` (optional) is called with every row that was written.
+    `parquet_path` (optional) also writes the rows as typed Parquet (needs pyarrow).
+    """
+
+    def __init__(
+        self,
+        paths: Iterable[Path],
+        columns: list[str] = BOOK_COLUMNS,
+        required: Iterable[str] = ("title",),
+        key: str = "title",
+        limit: int | None = None,
+        on_row: Optional[Callable[[dict[str, Any]], Any]] = None,
+        parquet_path: Optional[Path] = None,
+        dedup: Optional[Callable[[dict[str, Any]], bool]] = None,
+        raw_paths: Iterable[Path] = (),
+    ) -> None:
+        self.paths = [Path(p) for p in paths]
+        self.raw_paths = [Path(p) for p in raw_paths]
+        self.columns = list(columns)
+        self.required = tuple(required)
+        self.key = key
+        self.limit = limit or None
+        self.on_row = on_row
+        self.parquet_path = Path(parquet_path) if parquet_path else None
+        self.parquet: BookParquetWriter | None = None
+        self.dedup = dedup
+        self.written = 0
+        self.deduped = 0
+        self._seen: set[Any] = set()
+        self._files = []
+        self._writers = []
+        self._raw_writers = []
+
+    def _open(self, path: Path) -> csv.DictWriter:
+        f = path.open("w", newline="", encoding="utf-8")
+        w = csv.DictWriter(f, fieldnames=self.columns, extrasaction="ignore")
+        w.writeheader()
+        self._files.append(f)
+        return w
+
+    def __enter__(self) -> "CsvRowSink":
+        self._writers = [self._open(p) for p in self.paths]
+        self._raw_writers = [self._open(p) for p in self.raw_paths]
+        if self.parquet_path is not None:
+            self.parquet = BookParquetWriter(self.parquet_path)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def full(self) -> bool:
+        return self.limit is not None and self.written >= self.limit
+
+    def write(self, rows: Iterable[dict[str, Any]]) -> int:
+        """Write the rows that pass cleaning; returns how many were written."""
+        count = 0
+        kept = []
+        for row in rows:
+            if self.full:
+                break
+            if any(row.get(c) is None for c in self.required):
+                continue
+            k = row.get(self.key)
+            if k in self._seen:
+                continue
+            self._seen.add(k)
+            for w in self._raw_writers:
+                w.writerow(row)
+            if self.on_row is not None:
+                self.on_row(row)
+            self.written += 1
+            count += 1
+            if self.dedup is not None and self.dedup(row):
+                self.deduped += 1
+                continue
+            for w in self._writers:
+                w.writerow(row)
+            kept.append(row)
+        for f in self._files:
+            f.flush()
+        if self.parquet is not None:
+            self.parquet.write(kept)
+        return count
+
+    def close(self) -> None:
+        for f in self._files:
+            f.close()
+        self._files.clear()
+        self._writers.clear()
+        self._raw_writers.clear()
+        if self.parquet is not None:
+            self.parquet.close()
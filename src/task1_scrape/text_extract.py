@@ -0,0 +1,80 @@
+"""
+Fast page -> text-lines extraction for the Task 1 parsers.
+
+`lines_lxml()` feeds the raw bytes to libxml2's HTML parser with a *target*
+object, so text nodes are streamed straight into the line list and no tree is
+ever built. It reproduces
+
+    BeautifulSoup(html, "html.parser").get_text("\\n", strip=True).split("\\n")
+
+(one entry per non-empty stripped line; script/style/template/rt/rp text and
+comments skipped), which `lines_bs4()` keeps as the reference implementation.
+"""
+
+from __future__ import annotations
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+# Elements whose text BeautifulSoup.get_text() leaves out
+SKIP_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+
+
+def lines_bs4(html: str | bytes) -> list[str]:
+    soup = BeautifulSoup(html, "html.parser")
+    lines = [ln.strip() for ln in soup.get_text("\n", strip=True).split("\n")]
+    return [ln for ln in lines if ln]
+
+
+class _LineCollector:
+    """lxml parser target: collects text nodes outside SKIP_TAGS as stripped lines."""
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self._buf: list[str] = []
+        self._skip_depth = 0
+
+    def _flush(self) -> None:
+        if not self._buf:
+            return
+        text = "".join(self._buf)
+        self._buf.clear()
+        if self._skip_depth:
+            return
+        for ln in text.split("\n"):
+            ln = ln.strip()
+            if ln:
+                self.lines.append(ln)
+
+    def start(self, tag, attrib) -> None:
+        self._flush()
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+
+    def end(self, tag) -> None:
+        self._flush()
+        if tag in SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def data(self, text: str) -> None:
+        self._buf.append(text)
+
+    def comment(self, text: str) -> None:
+        self._flush()
+
+    def pi(self, target, data=None) -> None:
+        self._flush()
+
+    def close(self) -> list[str]:
+        self._flush()
+        return self.lines
+
+
+def lines_lxml(html: str | bytes) -> list[str]:
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+    if not html.strip():
+        return []
+    parser = etree.HTMLParser(target=_LineCollector(), encoding="utf-8", remove_comments=False)
+    parser.feed(html)
+    return parser.close()
@@ -0,0 +1,112 @@
+"""
+Task 2 helper: micro-benchmark for DataFrame -> DB parameter tuples (no MySQL needed).
+
+Compares the per-cell conversion import_csv used before (pd.isna / .item() on
+every value) with the column-wise frame_rows, on synthetic book frames typed
+the way read_books returns them (strings, Int64 year, float64 rating/price
+with missing ratings). Both paths must produce identical tuples.
+
+Run (from project root):
+    python -m src.task2_sql.benchmark_convert
+    python -m src.task2_sql.benchmark_convert --rows 10000 100000 1000000 --repeat 3 --out convert.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.task2_sql.import_csv import IMPORT_COLUMNS, frame_rows
+
+
+def frame_rows_per_cell(df: pd.DataFrame) -> list[tuple]:
+    """The previous conversion: one Python call per cell."""
+
+    def to_py(v):
+        if pd.isna(v):
+            return None
+        if hasattr(v, "item"):
+            try:
+                return v.item()
+            except Exception:
+                pass
+        return v
+
+    return [
+        tuple(to_py(v) for v in row)
+        for row in df[IMPORT_COLUMNS].itertuples(index=False, name=None)
+    ]
+
+
+def synthetic_books(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    ids = np.arange(n).astype(str)
+    rating = rng.uniform(1, 5, n).round(1)
+    rating[rng.random(n) < 0.3] = np.nan  # many listings have no rating
+    return pd.DataFrame(
+        {
+            "title": pd.Series("Book " + ids, dtype="string"),
+            "authors": pd.Series("Author " + (ids.astype(object) + ", Co Author"), dtype="string"),
+            "year": pd.Series(rng.integers(1995, 2026, n), dtype="Int64"),
+            "star_rating": rating,
+            "price": rng.uniform(5, 80, n).round(2),
+            "source_url": pd.Series("https://example.com/book/" + ids, dtype="string"),
+        }
+    )
+
+
+def _best_of(fn, df: pd.DataFrame, repeat: int) -> tuple[float, list[tuple]]:
+    best = float("inf")
+    out: list[tuple] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(df)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def run(sizes: list[int], repeat: int) -> list[dict]:
+    results = []
+    for n in sizes:
+        df = synthetic_books(n)
+        old_s, old_rows = _best_of(frame_rows_per_cell, df, repeat)
+        new_s, new_rows = _best_of(frame_rows, df, repeat)
+        if old_rows != new_rows:
+            raise AssertionError(f"column-wise conversion differs from the per-cell one at {n} rows")
+        del old_rows, new_rows
+        results.append(
+            {
+                "rows": n,
+                "per_cell_rows_per_sec": round(n / old_s),
+                "column_wise_rows_per_sec": round(n / new_s),
+                "speedup": round(old_s / new_s, 1),
+            }
+        )
+        r = results[-1]
+        print(
+            f"[CONVERT] {n:>9} rows: per-cell {r['per_cell_rows_per_sec']:>10} rows/sec | "
+            f"column-wise {r['column_wise_rows_per_sec']:>10} rows/sec | x{r['speedup']}"
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark DataFrame -> parameter tuple conversion")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3, help="Best of N runs per size")
+    parser.add_argument("--out", default=None, help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.rows, max(1, args.repeat))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"pandas": pd.__version__, "results": results}, f, indent=2)
+        print(f"[OK] Saved {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 import os
 import re
-import mysql.connector
 from mysql.connector import Error
 
+from src.common.db import get_connection
+
 IDENT_RE = re.compile(r"^[A-Za-z0-9_]+$")
 
 
@@ -15,26 +16,23 @@ def _validate_ident(name: str, kind: str) -> str:
 
 
 def get_server_conn():
-    """Connect to MySQL server WITHOUT selecting a database."""
-    return mysql.connector.connect(
-        host=os.getenv("DB_HOST", "127.0.0.1"),
-        port=int(os.getenv("DB_PORT", "3306")),
-        user=os.getenv("DB_USER", "root"),
-        password=os.getenv("DB_PASSWORD", ""),
-    )
+    """Pooled connection to the MySQL server WITHOUT selecting a database (close() returns it)."""
+    return get_connection()
+
+
+def _create_database(cur, db_name: str) -> None:
+    cur.execute(f"CREATE DATABASE IF NOT EXISTS `{db_name}` CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci;")
+    print(f"[DB] ensured database exists: {db_name}")
 
 
 def ensure_database(db_name: str) -> None:
     db_name = _validate_ident(db_name, "database name")
 
-    sql = f"CREATE DATABASE IF NOT EXISTS `{db_name}` CHARACTER SET utf8mb4 COLLATE utf8mb4_general_ci;"
-
     try:
         conn = get_server_conn()
         cur = conn.cursor()
-        cur.execute(sql)
+        _create_database(cur, db_name)
         conn.commit()
-        print(f"[DB] ensured database exists: {db_name}")
     except Error as e:
         raise RuntimeError(f"MySQL error while creating database: {e}") from e
     finally:
@@ -45,27 +43,240 @@ def ensure_database(db_name: str) -> None:
             pass
 
 
-def ensure_table(db_name: str, table_name: str) -> None:
-    db_name = _validate_ident(db_name, "database name")
-    table_name = _validate_ident(table_name, "table name")
+# Columns of the original table (schema version 0); everything after that is a migration below
+BASE_COLUMNS_SQL = [
+    "title VARCHAR(255) NOT NULL",
+    "authors TEXT NOT NULL",
+    "year INT NOT NULL",
+    "star_rating FLOAT NULL",
+    "price DECIMAL(10,2) NOT NULL",
+    "source_url TEXT NOT NULL",
+]
+
+# Natural key + content hash, computed by MySQL so every import mode (and any other writer) fills them
+ROW_KEY_COLUMNS_SQL = [
+    "row_key CHAR(40) AS (SHA1(CONCAT(title, '\\t', source_url))) STORED",
+    "content_hash CHAR(40) AS (SHA1(CONCAT_WS('\\t', authors, year, COALESCE(star_rating, ''), price))) STORED",
+]
+
+MIGRATIONS_TABLE = "schema_migrations"
+
+
+def staging_table_sql(table_name: str) -> str:
+    """
+    CREATE TEMPORARY TABLE with the import columns + row_key/content_hash.
+    (Not LIKE the target: InnoDB temporary tables can't hold its FULLTEXT index.)
+    """
+    cols = ",\n  ".join(BASE_COLUMNS_SQL + ROW_KEY_COLUMNS_SQL)
+    return f"CREATE TEMPORARY TABLE `{table_name}` (\n  {cols},\n  UNIQUE KEY uq_row_key (row_key)\n)"
+
+
+def _has_column(cur, db_name: str, table_name: str, column: str) -> bool:
+    cur.execute(
+        "SELECT COUNT(*) FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s",
+        (db_name, table_name, column),
+    )
+    return bool(cur.fetchone()[0])
+
+
+def _has_index(cur, db_name: str, table_name: str, index: str) -> bool:
+    cur.execute(
+        "SELECT COUNT(*) FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND INDEX_NAME = %s",
+        (db_name, table_name, index),
+    )
+    return bool(cur.fetchone()[0])
+
 
+# Secondary indexes by name. price: WHERE price >= x ORDER BY price DESC;
+# (year, price): ORDER BY year DESC, price DESC; FULLTEXT: MATCH(title, authors) AGAINST (...)
+SECONDARY_INDEXES = {
+    "idx_price": "INDEX idx_price (price)",
+    "idx_year_price": "INDEX idx_year_price (year, price)",
+    "ft_title_authors": "FULLTEXT INDEX ft_title_authors (title, authors)",
+}
+
+
+def add_indexes(cur, db_name: str, table_name: str, names) -> list[str]:
+    """Create the named SECONDARY_INDEXES the table does not have yet (FULLTEXT in its own ALTER)."""
+    missing = [n for n in names if not _has_index(cur, db_name, table_name, n)]
+    plain = [f"ADD {SECONDARY_INDEXES[n]}" for n in missing if not SECONDARY_INDEXES[n].startswith("FULLTEXT")]
+    if plain:
+        cur.execute(f"ALTER TABLE `{db_name}`.`{table_name}` {', '.join(plain)}")
+    for n in missing:
+        if SECONDARY_INDEXES[n].startswith("FULLTEXT"):
+            cur.execute(f"ALTER TABLE `{db_name}`.`{table_name}` ADD {SECONDARY_INDEXES[n]}")
+    return missing
+
+
+def drop_indexes(cur, db_name: str, table_name: str) -> list[str]:
+    """Drop the SECONDARY_INDEXES present on the table; returns their names (for add_indexes)."""
+    present = [n for n in SECONDARY_INDEXES if _has_index(cur, db_name, table_name, n)]
+    if present:
+        drops = ", ".join(f"DROP INDEX {n}" for n in present)
+        cur.execute(f"ALTER TABLE `{db_name}`.`{table_name}` {drops}")
+    return present
+
+
+# ---------- migrations ----------
+# Each step checks the live table before altering it: MySQL commits DDL implicitly, so a run that
+# dies between the ALTER and its schema_migrations row must be able to apply the step again.
+
+def _m001_row_key(cur, db_name: str, table_name: str) -> None:
+    if _has_column(cur, db_name, table_name, "row_key"):
+        return
+    adds = ", ".join(f"ADD COLUMN {col}" for col in ROW_KEY_COLUMNS_SQL)
+    cur.execute(f"ALTER TABLE `{db_name}`.`{table_name}` {adds}, ADD UNIQUE KEY uq_row_key (row_key)")
+
+
+def _m002_primary_key(cur, db_name: str, table_name: str) -> None:
+    if _has_index(cur, db_name, table_name, "PRIMARY"):
+        return
+    cur.execute(
+        f"ALTER TABLE `{db_name}`.`{table_name}` "
+        "ADD COLUMN id BIGINT UNSIGNED NOT NULL AUTO_INCREMENT PRIMARY KEY FIRST"
+    )
+
+
+def _m003_sort_indexes(cur, db_name: str, table_name: str) -> None:
+    add_indexes(cur, db_name, table_name, ["idx_price", "idx_year_price"])
+
+
+def _m004_fulltext(cur, db_name: str, table_name: str) -> None:
+    add_indexes(cur, db_name, table_name, ["ft_title_authors"])
+
+
+MIGRATIONS = [
+    (1, "row_key/content_hash + UNIQUE uq_row_key", _m001_row_key),
+    (2, "auto-increment primary key id", _m002_primary_key),
+    (3, "indexes idx_price (price), idx_year_price (year, price)", _m003_sort_indexes),
+    (4, "FULLTEXT ft_title_authors (title, authors)", _m004_fulltext),
+]
+
+
+def apply_migrations(cur, db_name: str, table_name: str) -> list[int]:
+    """Bring `table_name` up to the latest version; returns the versions applied by this call."""
+    cur.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS `{db_name}`.`{MIGRATIONS_TABLE}` (
+          table_name VARCHAR(64) NOT NULL,
+          version INT NOT NULL,
+          description VARCHAR(255) NOT NULL,
+          applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+          PRIMARY KEY (table_name, version)
+        )
+        """
+    )
+    cur.execute(f"SELECT version FROM `{db_name}`.`{MIGRATIONS_TABLE}` WHERE table_name = %s", (table_name,))
+    done = {row[0] for row in cur.fetchall()}
+
+    applied = []
+    for version, description, step in MIGRATIONS:
+        if version in done:
+            continue
+        print(f"[MIGRATE] {db_name}.{table_name} v{version}: {description}")
+        step(cur, db_name, table_name)
+        cur.execute(
+            f"INSERT IGNORE INTO `{db_name}`.`{MIGRATIONS_TABLE}` (table_name, version, description) "
+            "VALUES (%s, %s, %s)",
+            (table_name, version, description),
+        )
+        applied.append(version)
+    return applied
+
+
+def schema_version(cur, db_name: str, table_name: str) -> int:
+    cur.execute(
+        f"SELECT COALESCE(MAX(version), 0) FROM `{db_name}`.`{MIGRATIONS_TABLE}` WHERE table_name = %s",
+        (table_name,),
+    )
+    return int(cur.fetchone()[0])
+
+
+def _create_table(cur, db_name: str, table_name: str) -> None:
+    cols = ",\n      ".join(BASE_COLUMNS_SQL)
     create_table_sql = f"""
     CREATE TABLE IF NOT EXISTS `{db_name}`.`{table_name}` (
-      title VARCHAR(255) NOT NULL,
-      authors TEXT NOT NULL,
-      year INT NOT NULL,
-      star_rating FLOAT NULL,
-      price DECIMAL(10,2) NOT NULL,
-      source_url TEXT NOT NULL
+      {cols}
     );
     """
 
+    cur.execute(create_table_sql)
+    apply_migrations(cur, db_name, table_name)
+    print(f"[DB] ensured table exists: {db_name}.{table_name} (schema v{schema_version(cur, db_name, table_name)})")
+
+
+# ---------- normalized schema ----------
+# One row per book, one per distinct author, and a join table in author order. "Books by X" is an
+# index seek on authors.name + book_authors (author_id, book_id) instead of LIKE '%X%' on a TEXT column.
+SCHEMAS = ("flat", "normalized")
+NORMALIZED_TABLES = ("books", "authors", "book_authors")
+
+
+def _create_normalized_tables(cur, db_name: str) -> None:
+    cur.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS `{db_name}`.`authors` (
+          id INT UNSIGNED NOT NULL PRIMARY KEY,
+          name VARCHAR(255) NOT NULL,
+          KEY idx_author_name (name)
+        )
+        """
+    )
+    cur.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS `{db_name}`.`books` (
+          id BIGINT UNSIGNED NOT NULL PRIMARY KEY,
+          title VARCHAR(255) NOT NULL,
+          year INT NOT NULL,
+          star_rating FLOAT NULL,
+          price DECIMAL(10,2) NOT NULL,
+          source_url TEXT NOT NULL,
+          KEY idx_price (price),
+          KEY idx_year_price (year, price),
+          FULLTEXT KEY ft_title (title)
+        )
+        """
+    )
+    cur.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS `{db_name}`.`book_authors` (
+          book_id BIGINT UNSIGNED NOT NULL,
+          author_id INT UNSIGNED NOT NULL,
+          position TINYINT UNSIGNED NOT NULL,
+          PRIMARY KEY (book_id, author_id),
+          KEY idx_author_book (author_id, book_id),
+          CONSTRAINT fk_book_authors_book FOREIGN KEY (book_id) REFERENCES books (id) ON DELETE CASCADE,
+          CONSTRAINT fk_book_authors_author FOREIGN KEY (author_id) REFERENCES authors (id)
+        )
+        """
+    )
+    # The flat shape (authors as "A, B") for the 7C queries and exports
+    cur.execute(
+        f"""
+        CREATE OR REPLACE VIEW `{db_name}`.`books_flat` AS
+        SELECT b.id, b.title,
+               GROUP_CONCAT(a.name ORDER BY ba.position SEPARATOR ', ') AS authors,
+               b.year, b.star_rating, b.price, b.source_url
+        FROM `{db_name}`.`books` b
+        LEFT JOIN `{db_name}`.`book_authors` ba ON ba.book_id = b.id
+        LEFT JOIN `{db_name}`.`authors` a ON a.id = ba.author_id
+        GROUP BY b.id
+        """
+    )
+    print(f"[DB] ensured normalized tables exist: {db_name}.{{{', '.join(NORMALIZED_TABLES)}}} (+ view books_flat)")
+
+
+def ensure_table(db_name: str, table_name: str) -> None:
+    db_name = _validate_ident(db_name, "database name")
+    table_name = _validate_ident(table_name, "table name")
+
     try:
         conn = get_server_conn()
         cur = conn.cursor()
-        cur.execute(create_table_sql)
+        _create_table(cur, db_name, table_name)
         conn.commit()
-        print(f"[DB] ensured table exists: {db_name}.{table_name}")
     except Error as e:
         raise RuntimeError(f"MySQL error while creating table: {e}") from e
     finally:
@@ -76,9 +287,34 @@ def ensure_table(db_name: str, table_name: str) -> None:
             pass
 
 
-def ensure_schema(db_name: str, table_name: str) -> None:
-    ensure_database(db_name)
-    ensure_table(db_name, table_name)
+def ensure_schema(db_name: str, table_name: str, schema: str = "flat") -> None:
+    """
+    Database + tables over one pooled connection.
+    schema="flat": the single `table_name` table; schema="normalized": books/authors/book_authors
+    (`table_name` is not used).
+    """
+    db_name = _validate_ident(db_name, "database name")
+    table_name = _validate_ident(table_name, "table name")
+    if schema not in SCHEMAS:
+        raise ValueError(f"Unknown schema '{schema}'. Use one of: {', '.join(SCHEMAS)}")
+
+    try:
+        conn = get_server_conn()
+        cur = conn.cursor()
+        _create_database(cur, db_name)
+        if schema == "normalized":
+            _create_normalized_tables(cur, db_name)
+        else:
+            _create_table(cur, db_name, table_name)
+        conn.commit()
+    except Error as e:
+        raise RuntimeError(f"MySQL error while creating schema: {e}") from e
+    finally:
+        try:
+            cur.close()
+            conn.close()
+        except Exception:
+            pass
 
 
 if __name__ == "__main__":
@@ -95,4 +331,5 @@ if __name__ == "__main__":
     ensure_schema(
         db_name=os.getenv("DB_NAME", "module15_cw1_de_py"),
         table_name=os.getenv("DB_TABLE", "books_import_py"),
+        schema=os.getenv("DB_SCHEMA", "flat"),
     )
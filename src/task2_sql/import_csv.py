@@ -1,11 +1,18 @@
 import os
 import re
+import time
 import argparse
+import tempfile
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
 import pandas as pd
-import mysql.connector
 from mysql.connector import Error
 
-from src.common.paths import PROCESSED_DIR
+from src.common.authors import AuthorNormalizer
+from src.common.db import get_connection
+from src.common.io import default_books_path, iter_books, read_books
+from src.task2_sql.create_schema import SCHEMAS, add_indexes, drop_indexes, staging_table_sql
 
 IDENT_RE = re.compile(r"^[A-Za-z0-9_]+$")
 
@@ -16,72 +23,439 @@ def _validate_ident(name: str, kind: str) -> str:
     return name
 
 
-def get_conn(db_name: str):
+def get_conn(db_name: str, allow_local_infile: bool = False):
+    """Pooled connection to `db_name` (close() returns it to the pool)."""
     db_name = _validate_ident(db_name, "database name")
-    return mysql.connector.connect(
-        host=os.getenv("DB_HOST", "127.0.0.1"),
-        port=int(os.getenv("DB_PORT", "3306")),
-        user=os.getenv("DB_USER", "root"),
-        password=os.getenv("DB_PASSWORD", ""),
-        database=db_name,
-    )
+    if allow_local_infile:
+        return get_connection(db_name, allow_local_infile=True)
+    return get_connection(db_name)
 
 
-def import_csv(db_name: str, table_name: str, csv_path: str | None = None) -> int:
-    table_name = _validate_ident(table_name, "table name")
-
-    if csv_path is None:
-        csv_path = str(PROCESSED_DIR / "books.csv")
+IMPORT_COLUMNS = ["title", "authors", "year", "star_rating", "price", "source_url"]
+IMPORT_MODES = ("insert", "bulk", "stream", "upsert", "swap")
+DEFAULT_BATCH_SIZE = 5000
 
-    if not os.path.exists(csv_path):
-        raise FileNotFoundError(f"CSV not found: {csv_path}")
+# LOAD DATA LOCAL refused by the server or the client -> use executemany instead
+LOCAL_INFILE_ERRNOS = {1148, 2068, 3948, 3950}
 
-    df = pd.read_csv(csv_path)
 
-    required_cols = ["title", "authors", "year", "star_rating", "price", "source_url"]
-    missing = [c for c in required_cols if c not in df.columns]
+def clean_books_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Check the columns and drop rows that can't be inserted."""
+    missing = [c for c in IMPORT_COLUMNS if c not in df.columns]
     if missing:
         raise ValueError(f"CSV missing required columns: {missing}")
 
-    # Clean types
-    df["year"] = pd.to_numeric(df["year"], errors="coerce")
-    df["star_rating"] = pd.to_numeric(df["star_rating"], errors="coerce")
-    df["price"] = pd.to_numeric(df["price"], errors="coerce")
-
     # Drop rows that can’t be inserted
-    df = df.dropna(subset=["title", "authors", "year", "price", "source_url"]).copy()
+    return df.dropna(subset=["title", "authors", "year", "price", "source_url"]).copy()
 
-    def to_py(v):
-        if pd.isna(v):
-            return None
-        if hasattr(v, "item"):
-            try:
-                return v.item()
-            except Exception:
-                pass
-        return v
 
-    rows = [
-        tuple(to_py(v) for v in row)
-        for row in df[required_cols].itertuples(index=False, name=None)
-    ]
+def load_books_frame(csv_path: str) -> pd.DataFrame:
+    """Read the whole snapshot (CSV or Parquet), cleaned."""
+    return clean_books_frame(read_books(csv_path))
+
+
+def column_values(col: pd.Series) -> list:
+    """
+    One column -> list of native Python values, None where missing (NaN / NA / NaT).
+    Typed columns are converted by numpy/pandas in one pass; only an object column
+    that holds something other than strings is checked value by value.
+    """
+    values = col.to_numpy(dtype=object, na_value=None).tolist()
+    if col.dtype == object and pd.api.types.infer_dtype(col, skipna=True) not in ("string", "empty"):
+        values = [v.item() if isinstance(v, np.generic) else v for v in values]
+    return values
+
+
+def frame_rows(df: pd.DataFrame) -> list[tuple]:
+    """DataFrame -> DB parameter tuples in IMPORT_COLUMNS order (converted column by column)."""
+    return list(zip(*(column_values(df[c]) for c in IMPORT_COLUMNS)))
+
 
+# A repeated (title, source_url) in one snapshot updates the earlier row instead of failing on uq_row_key
+ON_DUPLICATE_SQL = (
+    "ON DUPLICATE KEY UPDATE authors = VALUES(authors), year = VALUES(year), "
+    "star_rating = VALUES(star_rating), price = VALUES(price)"
+)
+
+
+def _insert_rows(cur, table_name: str, rows: list[tuple]) -> None:
     insert_sql = f"""
         INSERT INTO `{table_name}` (title, authors, year, star_rating, price, source_url)
         VALUES (%s, %s, %s, %s, %s, %s)
+        {ON_DUPLICATE_SQL}
+    """
+    cur.executemany(insert_sql, rows)
+
+
+def _insert_batch(cur, table_name: str, rows: list[tuple]) -> None:
+    """One multi-row INSERT ... VALUES (...), (...), ... statement for the whole batch."""
+    values = ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(rows))
+    cur.execute(
+        f"INSERT INTO `{table_name}` (title, authors, year, star_rating, price, source_url) VALUES {values} "
+        f"{ON_DUPLICATE_SQL}",
+        [v for row in rows for v in row],
+    )
+
+
+def iter_row_chunks(csv_path: str, batch_size: int) -> Iterator[list[tuple]]:
+    """Read and convert the snapshot `batch_size` rows at a time (memory stays flat)."""
+    for chunk in iter_books(csv_path, batch_rows=batch_size):
+        yield frame_rows(clean_books_frame(chunk))
+
+
+def batch_chunks(rows: Sequence[tuple], batch_size: int) -> Iterator[Sequence[tuple]]:
+    """Slices of an already converted row batch."""
+    for start in range(0, len(rows), batch_size):
+        yield rows[start:start + batch_size]
+
+
+def _stream_import(conn, cur, table_name: str, chunks: Iterable[Sequence[tuple]], commit: bool = True) -> int:
+    """Insert the snapshot chunk by chunk (one multi-row INSERT each), committing each batch."""
+    done = 0
+    t0 = time.perf_counter()
+    for i, rows in enumerate(chunks, start=1):
+        if rows:
+            _insert_batch(cur, table_name, rows)
+        if commit:
+            conn.commit()
+        done += len(rows)
+        elapsed = time.perf_counter() - t0
+        print(f"[STREAM] batch {i}: +{len(rows)} rows (total {done}, {done / elapsed if elapsed else 0:.0f} rows/sec)")
+    return done
+
+
+def _upsert_import(conn, cur, table_name: str, chunks: Iterable[Sequence[tuple]]) -> dict[str, int]:
+    """
+    Incremental load: stage the snapshot in a temp table, then write only the difference
+    (changed content_hash -> update, new row_key -> insert, row_key gone -> delete) in one
+    transaction. Unchanged rows are not touched, so reloading the same snapshot is ~a no-op.
     """
+    staging = f"{table_name}__incoming"
+    cur.execute(f"DROP TEMPORARY TABLE IF EXISTS `{staging}`")
+    cur.execute(staging_table_sql(staging))
+    try:
+        staged = _stream_import(conn, cur, staging, chunks, commit=False)
+        # uq_row_key merges repeats within the snapshot, so count what staging holds
+        cur.execute(f"SELECT COUNT(*) FROM `{staging}`")
+        distinct = int(cur.fetchone()[0])
+
+        cur.execute(
+            f"UPDATE `{table_name}` t JOIN `{staging}` s ON s.row_key = t.row_key "
+            f"SET t.authors = s.authors, t.year = s.year, t.star_rating = s.star_rating, t.price = s.price "
+            f"WHERE t.content_hash <> s.content_hash"
+        )
+        updated = cur.rowcount
+
+        cols = "title, authors, year, star_rating, price, source_url"
+        cur.execute(
+            f"INSERT INTO `{table_name}` ({cols}) "
+            f"SELECT s.title, s.authors, s.year, s.star_rating, s.price, s.source_url "
+            f"FROM `{staging}` s LEFT JOIN `{table_name}` t ON t.row_key = s.row_key "
+            f"WHERE t.row_key IS NULL"
+        )
+        inserted = cur.rowcount
+        cur.execute(
+            f"DELETE t FROM `{table_name}` t LEFT JOIN `{staging}` s ON s.row_key = t.row_key "
+            f"WHERE s.row_key IS NULL"
+        )
+        deleted = cur.rowcount
+        conn.commit()
+    except Error:
+        conn.rollback()
+        raise
+    finally:
+        cur.execute(f"DROP TEMPORARY TABLE IF EXISTS `{staging}`")
+
+    counts = {
+        "staged": staged,
+        "distinct": distinct,
+        "inserted": inserted,
+        "updated": updated,
+        "deleted": deleted,
+        "unchanged": distinct - inserted - updated,
+    }
+    print(
+        f"[UPSERT] inserted={inserted} updated={updated} deleted={deleted} "
+        f"unchanged={counts['unchanged']} (snapshot rows: {staged}, distinct keys: {distinct})"
+    )
+    return counts
+
 
+def _swap_import(conn, cur, db_name: str, table_name: str, chunks: Iterable[Sequence[tuple]]) -> int:
+    """
+    Zero-downtime reload: fill `<table>__staging` (same definition, secondary indexes dropped
+    while loading), build its indexes, then swap it in with one atomic RENAME TABLE.
+    Readers keep using the old, fully indexed table until the rename; it stays as
+    `<table>__previous` for rollback_swap().
+    """
+    staging, previous = f"{table_name}__staging", f"{table_name}__previous"
+    cur.execute(f"DROP TABLE IF EXISTS `{staging}`")
+    cur.execute(f"CREATE TABLE `{staging}` LIKE `{table_name}`")
+    indexes = drop_indexes(cur, db_name, staging)
+
+    loaded = _stream_import(conn, cur, staging, chunks)
+
+    t0 = time.perf_counter()
+    add_indexes(cur, db_name, staging, indexes)
+    cur.execute(f"ANALYZE TABLE `{staging}`")
+    cur.fetchall()
+    print(f"[SWAP] built {len(indexes)} indexes on {staging} in {time.perf_counter() - t0:.2f}s")
+
+    cur.execute(f"DROP TABLE IF EXISTS `{previous}`")
+    cur.execute(f"RENAME TABLE `{table_name}` TO `{previous}`, `{staging}` TO `{table_name}`")
+    print(f"[SWAP] {staging} is now {table_name} (old contents kept in {previous})")
+    return loaded
+
+
+def rollback_swap(db_name: str, table_name: str) -> None:
+    """Undo the last swap: `<table>__previous` comes back; the replaced table becomes `<table>__staging`."""
+    table_name = _validate_ident(table_name, "table name")
+    staging, previous = f"{table_name}__staging", f"{table_name}__previous"
     try:
         conn = get_conn(db_name)
         cur = conn.cursor()
+        cur.execute(f"DROP TABLE IF EXISTS `{staging}`")
+        cur.execute(f"RENAME TABLE `{table_name}` TO `{staging}`, `{previous}` TO `{table_name}`")
+        print(f"[SWAP] rolled back {db_name}.{table_name} to {previous}")
+    except Error as e:
+        raise RuntimeError(f"MySQL error while rolling back: {e}") from e
+    finally:
+        try:
+            cur.close()
+            conn.close()
+        except Exception:
+            pass
+
 
-        cur.execute(f"TRUNCATE TABLE `{table_name}`;")
-        cur.executemany(insert_sql, rows)
+def _tsv_field(v) -> str:
+    """One value in LOAD DATA's default text format (tab-separated, backslash escapes, \\N = NULL)."""
+    if v is None:
+        return "\\N"
+    if isinstance(v, float):
+        return repr(v)
+    return (
+        str(v)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def write_staging_file(rows: list[tuple], path: str) -> None:
+    """Cleaned, typed rows -> TSV file that LOAD DATA reads without any conversion."""
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for row in rows:
+            f.write("\t".join(_tsv_field(v) for v in row))
+            f.write("\n")
+
+
+def _bulk_load(cur, table_name: str, rows: list[tuple]) -> None:
+    """
+    LOAD DATA LOCAL INFILE from a staged temp file. REPLACE: a repeated (title, source_url)
+    overwrites the earlier row (last one wins, like ON DUPLICATE KEY UPDATE in the other modes);
+    unique checks stay on so uq_row_key stays exact.
+    """
+    fd, staging_path = tempfile.mkstemp(prefix=f"{table_name}_", suffix=".tsv")
+    os.close(fd)
+    try:
+        write_staging_file(rows, staging_path)
+        infile = staging_path.replace("\\", "/").replace("'", "\\'")
+        cur.execute("SET SESSION foreign_key_checks = 0")
+        # Defers non-unique index maintenance (MyISAM; a no-op on InnoDB)
+        cur.execute(f"ALTER TABLE `{table_name}` DISABLE KEYS")
+        try:
+            cur.execute(
+                f"LOAD DATA LOCAL INFILE '{infile}' REPLACE INTO TABLE `{table_name}` "
+                "CHARACTER SET utf8mb4 "
+                "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+                "LINES TERMINATED BY '\\n' "
+                "(title, authors, year, star_rating, price, source_url)"
+            )
+        finally:
+            cur.execute(f"ALTER TABLE `{table_name}` ENABLE KEYS")
+            cur.execute("SET SESSION foreign_key_checks = 1")
+    finally:
+        os.remove(staging_path)
+
+
+def snapshot_path(csv_path: str | None = None) -> str:
+    """The file to import: `csv_path`, else books.parquet (typed, memory-mapped) when it is current, else books.csv."""
+    if csv_path is None:
+        csv_path = str(default_books_path())
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"CSV not found: {csv_path}")
+    return csv_path
+
+
+def load_rows(csv_path: str | None = None) -> tuple[tuple, ...]:
+    """
+    Read, clean and convert the snapshot once into an immutable row batch.
+    Pass it to import_csv(rows=...) for each target: nothing is re-parsed, and
+    threads can share it safely.
+    """
+    return tuple(frame_rows(load_books_frame(snapshot_path(csv_path))))
+
+
+def import_csv(
+    db_name: str,
+    table_name: str,
+    csv_path: str | None = None,
+    mode: str | None = None,
+    batch_size: int | None = None,
+    rows: Sequence[tuple] | None = None,
+) -> int:
+    """
+    Replace the table contents with the snapshot rows.
+
+    mode="insert": executemany (works everywhere).
+    mode="bulk":   stage a TSV file and LOAD DATA LOCAL INFILE it (much faster on large files);
+                   falls back to "insert" if the server or client does not allow local infile.
+    mode="stream": read `batch_size` rows at a time and insert each chunk with one multi-row
+                   INSERT + COMMIT, so memory and transaction size stay constant.
+    mode="upsert": no TRUNCATE; insert new rows, update rows whose content_hash changed and
+                   delete rows missing from the snapshot (keyed on row_key = SHA1(title, source_url)).
+    mode="swap":   no TRUNCATE; load `<table>__staging` and RENAME it over the table, so readers
+                   never see an empty or partial table (the old one is kept as `<table>__previous`).
+
+    `rows`: an already converted batch (see load_rows); the file is not read at all.
+    """
+    table_name = _validate_ident(table_name, "table name")
+    mode = mode or os.getenv("DB_IMPORT_MODE", "insert")
+    batch_size = batch_size or int(os.getenv("DB_IMPORT_BATCH", str(DEFAULT_BATCH_SIZE)))
+    if mode not in IMPORT_MODES:
+        raise ValueError(f"Unknown import mode '{mode}'. Use one of: {', '.join(IMPORT_MODES)}")
+
+    if rows is None:
+        csv_path = snapshot_path(csv_path)
+        # stream/upsert/swap modes read the file chunk by chunk inside the load
+        if mode not in ("stream", "upsert", "swap"):
+            rows = frame_rows(load_books_frame(csv_path))
+    chunks = iter_row_chunks(csv_path, batch_size) if rows is None else batch_chunks(rows, batch_size)
+
+    try:
+        conn = get_conn(db_name, allow_local_infile=(mode == "bulk"))
+        cur = conn.cursor()
+
+        t0 = time.perf_counter()
+        if mode not in ("upsert", "swap"):
+            cur.execute(f"TRUNCATE TABLE `{table_name}`;")
+        if mode == "bulk":
+            try:
+                _bulk_load(cur, table_name, rows)
+            except Error as e:
+                if e.errno not in LOCAL_INFILE_ERRNOS:
+                    raise
+                print(f"[BULK] LOAD DATA LOCAL INFILE not allowed ({e.msg}); falling back to executemany")
+                conn.rollback()
+                mode = "insert"
+        if mode == "insert":
+            _insert_rows(cur, table_name, rows)
+        if mode == "stream":
+            loaded = _stream_import(conn, cur, table_name, chunks)
+        elif mode == "upsert":
+            loaded = _upsert_import(conn, cur, table_name, chunks)["staged"]
+        elif mode == "swap":
+            loaded = _swap_import(conn, cur, db_name, table_name, chunks)
+        else:
+            loaded = len(rows)
         conn.commit()
+        elapsed = time.perf_counter() - t0
 
         cur.execute(f"SELECT COUNT(*) FROM `{table_name}`;")
         count = cur.fetchone()[0]
-        print(f"[OK] Inserted rows into {db_name}.{table_name}: {count}")
+        print(f"[OK] Rows in {db_name}.{table_name}: {count}")
+        print(f"[RATE] mode={mode} {loaded} rows in {elapsed:.2f}s ({loaded / elapsed if elapsed else 0:.0f} rows/sec)")
+        return int(count)
+
+    except Error as e:
+        raise RuntimeError(f"MySQL error: {e}") from e
+    finally:
+        try:
+            cur.close()
+            conn.close()
+        except Exception:
+            pass
+
+
+def normalize_rows(rows: Iterable[tuple]) -> tuple[list[tuple], list[tuple], list[tuple]]:
+    """
+    Flat (title, authors, year, star_rating, price, source_url) rows -> rows for the normalized
+    schema: books (id, title, year, star_rating, price, source_url), authors (id, name) and
+    book_authors (book_id, author_id, position).
+
+    Author strings are split with AuthorNormalizer; its name -> id map resolves each distinct
+    author once per load. A repeated (title, source_url) keeps its first position and the last
+    values, like ON DUPLICATE KEY UPDATE in the flat table.
+    """
+    unique: dict[tuple, tuple] = {}
+    for row in rows:
+        unique[(row[0], row[5])] = row
+
+    names = AuthorNormalizer()
+    books, links = [], []
+    for book_id, (title, authors, year, star_rating, price, source_url) in enumerate(unique.values(), start=1):
+        books.append((book_id, title, year, star_rating, price, source_url))
+        for position, author_id in enumerate(names.author_ids(authors), start=1):
+            links.append((book_id, author_id, position))
+    return books, list(names.table().items()), links
+
+
+def _insert_chunked(cur, table_name: str, columns: Sequence[str], rows: Sequence[tuple], batch_size: int) -> None:
+    """Multi-row INSERTs of at most `batch_size` rows each."""
+    placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    for chunk in batch_chunks(rows, batch_size):
+        cur.execute(
+            f"INSERT INTO `{table_name}` ({', '.join(columns)}) VALUES {', '.join([placeholders] * len(chunk))}",
+            [v for row in chunk for v in row],
+        )
+
+
+def import_normalized(
+    db_name: str,
+    csv_path: str | None = None,
+    batch_size: int | None = None,
+    rows: Sequence[tuple] | None = None,
+) -> int:
+    """
+    Replace the contents of books / authors / book_authors (create_schema schema="normalized")
+    with the snapshot in one transaction (DELETE, not TRUNCATE, which would commit), in
+    multi-row batches. Readers see the old contents until the commit; a failed load rolls back.
+    """
+    batch_size = batch_size or int(os.getenv("DB_IMPORT_BATCH", str(DEFAULT_BATCH_SIZE)))
+    if rows is None:
+        rows = frame_rows(load_books_frame(snapshot_path(csv_path)))
+
+    t0 = time.perf_counter()
+    books, authors, links = normalize_rows(rows)
+    split_s = time.perf_counter() - t0
+
+    try:
+        conn = get_conn(db_name)
+        cur = conn.cursor()
+
+        t0 = time.perf_counter()
+        try:
+            # Link table first, so the foreign keys never point at a deleted row
+            for table in ("book_authors", "books", "authors"):
+                cur.execute(f"DELETE FROM `{table}`")
+
+            _insert_chunked(cur, "authors", ("id", "name"), authors, batch_size)
+            _insert_chunked(cur, "books", ("id", "title", "year", "star_rating", "price", "source_url"), books, batch_size)
+            _insert_chunked(cur, "book_authors", ("book_id", "author_id", "position"), links, batch_size)
+            conn.commit()
+        except Error:
+            conn.rollback()
+            raise
+        elapsed = time.perf_counter() - t0
+
+        cur.execute("SELECT COUNT(*) FROM `books`")
+        count = cur.fetchone()[0]
+        print(
+            f"[OK] {db_name}: books={count} authors={len(authors)} book_authors={len(links)} "
+            f"(authors split in {split_s:.2f}s)"
+        )
+        print(f"[RATE] schema=normalized {len(books)} books in {elapsed:.2f}s ({len(books) / elapsed if elapsed else 0:.0f} rows/sec)")
         return int(count)
 
     except Error as e:
@@ -98,10 +472,41 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--db", default=os.getenv("DB_NAME", "module15_cw1_de"), help="Database name")
     parser.add_argument("--table", default=os.getenv("DB_TABLE", "books_import_py"), help="Table name")
-    parser.add_argument("--csv", default=None, help="Path to CSV (defaults to data/processed/books.csv)")
+    parser.add_argument(
+        "--mode",
+        choices=IMPORT_MODES,
+        default=None,
+        help="insert = executemany; bulk = LOAD DATA LOCAL INFILE (falls back to insert); "
+        "stream = chunked multi-row INSERTs; upsert = incremental (only changed rows); "
+        "swap = load a staging table and RENAME it in. Default: DB_IMPORT_MODE or insert",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help=f"Rows per chunk/commit in stream mode (default: DB_IMPORT_BATCH or {DEFAULT_BATCH_SIZE})",
+    )
+    parser.add_argument("--csv", default=None, help="Path to CSV or Parquet (defaults to data/processed/books.parquet, else books.csv)")
+    parser.add_argument(
+        "--schema",
+        choices=SCHEMAS,
+        default=os.getenv("DB_SCHEMA", "flat"),
+        help="flat = one table (--table, --mode); normalized = books/authors/book_authors. Default: DB_SCHEMA or flat",
+    )
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Undo the last swap-mode load (restore <table>__previous) instead of importing",
+    )
     args = parser.parse_args()
 
-    import_csv(db_name=args.db, table_name=args.table, csv_path=args.csv)
+    if args.rollback:
+        rollback_swap(args.db, args.table)
+        return
+    if args.schema == "normalized":
+        import_normalized(db_name=args.db, csv_path=args.csv, batch_size=args.batch_size)
+        return
+    import_csv(db_name=args.db, table_name=args.table, csv_path=args.csv, mode=args.mode, batch_size=args.batch_size)
 
 
 if __name__ == "__main__":
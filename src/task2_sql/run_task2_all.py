@@ -1,8 +1,10 @@
 import os
+import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 
-from src.task2_sql.create_schema import ensure_schema
-from src.task2_sql.import_csv import import_csv
+from src.task2_sql.create_schema import SCHEMAS, ensure_schema
+from src.task2_sql.import_csv import IMPORT_MODES, import_csv, import_normalized, load_rows
 
 
 def load_env():
@@ -15,6 +17,35 @@ def load_env():
             os.environ.setdefault(k.strip(), v.strip())
 
 
+def sync_target(db_name: str, table: str, rows, mode: str | None, batch_size: int | None, schema: str = "flat") -> dict:
+    """Schema + import for one database from the shared row batch (own pooled connections)."""
+    t0 = time.perf_counter()
+    try:
+        ensure_schema(db_name, table, schema=schema)
+        if schema == "normalized":
+            count = import_normalized(db_name=db_name, batch_size=batch_size, rows=rows)
+        else:
+            count = import_csv(db_name=db_name, table_name=table, mode=mode, batch_size=batch_size, rows=rows)
+        return {"db": db_name, "ok": True, "rows": count, "seconds": time.perf_counter() - t0}
+    except Exception as e:
+        print(f"[ERROR] {db_name}: {e}")
+        return {"db": db_name, "ok": False, "error": str(e), "seconds": time.perf_counter() - t0}
+
+
+def sync_targets(
+    db_names: list[str],
+    table: str,
+    rows,
+    mode: str | None = None,
+    batch_size: int | None = None,
+    schema: str = "flat",
+) -> list[dict]:
+    """Load the same batch into every database concurrently; results in `db_names` order."""
+    with ThreadPoolExecutor(max_workers=len(db_names), thread_name_prefix="task2") as pool:
+        futures = [pool.submit(sync_target, db, table, rows, mode, batch_size, schema) for db in db_names]
+        return [f.result() for f in futures]
+
+
 def main():
     parser = argparse.ArgumentParser(description="Task 2: create schema + import CSV (one or more DBs)")
     parser.add_argument("--table", default="books_import_py", help="Table name")
@@ -33,33 +64,65 @@ def main():
         default=None,
         help="Override UI DB name (if not set, uses DB_NAME from .env or module15_cw1_de)",
     )
+    parser.add_argument(
+        "--mode",
+        choices=IMPORT_MODES,
+        default=None,
+        help="Import mode: insert (executemany), bulk (LOAD DATA LOCAL INFILE), stream (chunked), "
+        "upsert (incremental) or swap (staging table + atomic RENAME). "
+        "Default: DB_IMPORT_MODE or insert",
+    )
+    parser.add_argument("--batch-size", type=int, default=None, help="Rows per chunk/commit in stream mode")
+    parser.add_argument(
+        "--schema",
+        choices=SCHEMAS,
+        default=None,
+        help="flat (one table) or normalized (books/authors/book_authors). Default: DB_SCHEMA or flat",
+    )
+    parser.add_argument(
+        "--extra-db",
+        action="append",
+        default=None,
+        help="Another DB to load the same snapshot into (repeatable)",
+    )
+    parser.add_argument("--csv", default=None, help="Path to CSV or Parquet (defaults to data/processed/books.parquet, else books.csv)")
     args = parser.parse_args()
 
     load_env()
 
     table = args.table
+    schema = args.schema or os.getenv("DB_SCHEMA", "flat")
 
     print("=== TASK 2 RUNNER ===")
-    print(f"[INFO] Table: {table}")
+    print(f"[INFO] Table: {table}" if schema == "flat" else "[INFO] Tables: books, authors, book_authors")
+
+    # Primary DB (code-created) + optional UI DB / extra targets
+    targets = [args.primary_db]
+    if args.also_ui:
+        targets.append(args.ui_db or os.getenv("DB_NAME", "module15_cw1_de"))
+    targets += args.extra_db or []
+    targets = list(dict.fromkeys(targets))
+    print(f"[INFO] Targets: {', '.join(targets)}")
 
-    # --- Primary DB (code-created) ---
-    primary_db = args.primary_db
-    print(f"\n[PRIMARY] {primary_db}")
-    print("[STEP 1] Ensure schema (DB + table)")
-    ensure_schema(primary_db, table)
+    print("[STEP 1] Read + convert the snapshot (once)")
+    t0 = time.perf_counter()
+    rows = load_rows(args.csv)
+    print(f"[PARSE] {len(rows)} rows in {time.perf_counter() - t0:.2f}s")
 
-    print("[STEP 2] Import CSV")
-    import_csv(db_name=primary_db, table_name=table)
+    print(f"[STEP 2] Ensure schema + import into {len(targets)} DB(s) in parallel")
+    t0 = time.perf_counter()
+    results = sync_targets(targets, table, rows, mode=args.mode, batch_size=args.batch_size, schema=schema)
+    wall = time.perf_counter() - t0
 
-    # --- Optional UI DB sync ---
-    if args.also_ui:
-        ui_db = args.ui_db or os.getenv("DB_NAME", "module15_cw1_de")
-        print(f"\n[UI] {ui_db}")
-        print("[STEP 1] Ensure table exists (safe even if DB already exists)")
-        ensure_schema(ui_db, table)
+    print("\n[SUMMARY]")
+    for r in results:
+        status = f"{r['rows']} rows" if r["ok"] else f"FAILED ({r['error']})"
+        print(f"  {r['db']}: {status} in {r['seconds']:.2f}s")
+    slowest = max(r["seconds"] for r in results)
+    print(f"  wall {wall:.2f}s (slowest target {slowest:.2f}s, sum {sum(r['seconds'] for r in results):.2f}s)")
 
-        print("[STEP 2] Import CSV")
-        import_csv(db_name=ui_db, table_name=table)
+    if not all(r["ok"] for r in results):
+        raise SystemExit(1)
 
     print("\n[DONE] Task 2 runner finished.")
 
@@ -21,12 +21,18 @@ from __future__ import annotations
 
 import argparse
 import os
+import sys
 import time
 from pathlib import Path
 
-import mysql.connector
 from pymongo import MongoClient
 
+try:
+    from src.common.db import connection
+except ImportError:  # run as a plain script from another folder
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from src.common.db import connection
+
 
 def load_env_from_project_root() -> None:
     """Walk upward to find and load a .env file if present."""
@@ -44,40 +50,41 @@ def load_env_from_project_root() -> None:
 
 
 def mysql_query_benchmark(host: str, port: int, user: str, password: str, db: str, table: str, min_price: float) -> tuple[float, int]:
-    """Filter + sort query benchmark in MySQL."""
-    t0 = time.perf_counter()
-    conn = mysql.connector.connect(host=host, port=port, user=user, password=password, database=db)
-    cur = conn.cursor()
-
-    sql = f"""
-    SELECT title, year, price
-    FROM {table}
-    WHERE price >= %s
-    ORDER BY price DESC;
-    """
-    cur.execute(sql, (min_price,))
-    rows = cur.fetchall()
-
-    cur.close()
-    conn.close()
-    t1 = time.perf_counter()
+    """Filter + sort query benchmark in MySQL (pooled connection: connect/login is not timed)."""
+    with connection(db, host=host, port=port, user=user, password=password) as conn:
+        cur = conn.cursor()
+
+        sql = f"""
+        SELECT title, year, price
+        FROM {table}
+        WHERE price >= %s
+        ORDER BY price DESC;
+        """
+        t0 = time.perf_counter()
+        cur.execute(sql, (min_price,))
+        rows = cur.fetchall()
+        t1 = time.perf_counter()
+
+        cur.close()
     return (t1 - t0), len(rows)
 
 
 def mongo_query_benchmark(uri: str, db: str, collection: str, min_price: float) -> tuple[float, int]:
-    """Filter + sort query benchmark in MongoDB."""
-    t0 = time.perf_counter()
+    """Filter + sort query benchmark in MongoDB (client connected before timing, like the MySQL pool)."""
     client = MongoClient(uri)
+    client.admin.command("ping")
     coll = client[db][collection]
 
+    t0 = time.perf_counter()
+
     cursor = coll.find(
         {"price": {"$gte": min_price}},
         {"_id": 0, "title": 1, "year": 1, "price": 1},
     ).sort("price", -1)
 
     rows = list(cursor)
-    client.close()
     t1 = time.perf_counter()
+    client.close()
     return (t1 - t0), len(rows)
 
 
@@ -19,16 +19,26 @@ Run (recommended):
 
 Or:
   python src/task4_mongo/csv_to_json.py
+
+Input: data/processed/books.parquet when Task 1 wrote it (typed, no CSV parsing),
+otherwise data/processed/books.csv.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import sys
 from pathlib import Path
 
 import pandas as pd
 
+try:
+    from src.common.io import default_books_path, read_books
+except ImportError:  # run as a plain script: python src/task4_mongo/csv_to_json.py
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from src.common.io import default_books_path, read_books
+
 
 def find_project_root(start: Path) -> Path:
     """
@@ -54,10 +64,12 @@ def normalize_records(df: pd.DataFrame) -> list[dict]:
 
     df = df.copy()
 
-    # clean numeric types
-    df["year"] = pd.to_numeric(df["year"], errors="coerce").astype("Int64")
-    df["star_rating"] = pd.to_numeric(df["star_rating"], errors="coerce")
-    df["price"] = pd.to_numeric(df["price"], errors="coerce")
+    # clean numeric types (already typed when the frame came from read_books)
+    if df["year"].dtype != "Int64":
+        df["year"] = pd.to_numeric(df["year"], errors="coerce").astype("Int64")
+    for col in ("star_rating", "price"):
+        if not pd.api.types.is_float_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors="coerce")
 
     # add a simple source label (optional but useful)
     if "source" not in df.columns:
@@ -69,13 +81,17 @@ def normalize_records(df: pd.DataFrame) -> list[dict]:
 
 def main() -> None:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--csv", type=str, default=None, help="Path to books.csv (optional)")
+    parser.add_argument("--csv", type=str, default=None, help="Path to books.csv or books.parquet (optional)")
     parser.add_argument("--out_dir", type=str, default=None, help="Output directory (optional)")
     args = parser.parse_args()
 
     project_root = find_project_root(Path.cwd())
 
-    csv_path = Path(args.csv).resolve() if args.csv else (project_root / "data" / "processed" / "books.csv")
+    if args.csv:
+        csv_path = Path(args.csv).resolve()
+    else:
+        # Prefer the typed Parquet snapshot when Task 1 wrote one (and it is not older than the CSV)
+        csv_path = default_books_path(project_root / "data" / "processed")
     out_dir = Path(args.out_dir).resolve() if args.out_dir else (project_root / "data" / "exports")
     out_dir.mkdir(parents=True, exist_ok=True)
 
@@ -87,7 +103,7 @@ def main() -> None:
             "Fix: either create the CSV by running Task 1, or run with --csv <path>"
         )
 
-    df = pd.read_csv(csv_path)
+    df = read_books(csv_path)
     records = normalize_records(df)
 
     json_array_path = out_dir / "books.json"